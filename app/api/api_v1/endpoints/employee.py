@@ -1,13 +1,17 @@
 from typing import Any, List
 
 from fastapi import APIRouter, Depends, HTTPException
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from app.api import deps
 from app.core.config import Settings, get_settings
+from app.core.security import token_revocations
 from app.schemas.employee import CreateEmployee, Employee, UpdateEmployee
 from app.schemas.search import EmployeeQueryParams
+from app.services.concurrency import gather_or_cancel
 from app.services.employee import employee_service
+from app.services.notification import notification_outbox
+from app.utils.pagination import NEXT_CURSOR_HEADER, next_cursor
 from app.utils.send_email import send_new_account, send_updated_personal_information
 
 settings: Settings = get_settings()
@@ -35,8 +39,9 @@ async def create_employee_admin(
     """
     Create new employee.
     """
-    employee_username = await employee_service.get_by_username(
-        username=employee_in.username
+    employee_username, employee_id = await gather_or_cancel(
+        employee_service.get_by_username(username=employee_in.username),
+        employee_service.get_by_id(employee_id=employee_in.identity_card),
     )
     if employee_username:
         raise HTTPException(
@@ -44,9 +49,6 @@ async def create_employee_admin(
             detail="The employee with this username already exists in the system.",
         )
 
-    employee_id = await employee_service.get_by_id(
-        employee_id=employee_in.identity_card
-    )
     if employee_id:
         raise HTTPException(
             status_code=400,
@@ -54,7 +56,8 @@ async def create_employee_admin(
         )
     employee = await employee_service.create(employee_in=employee_in)
     if employee_in.email:
-        await send_new_account(
+        notification_outbox.enqueue(
+            send_new_account,
             email_to=employee_in.email,
             username=employee_in.username,
             name=employee_in.names,
@@ -134,6 +137,7 @@ async def get_profile(
         201: {"description": "Employee updated"},
         401: {"description": "User unauthorized"},
         404: {"description": "Employee not found"},
+        503: {"description": "Issued tokens could not be revoked"},
     },
 )
 async def update_employee(
@@ -145,13 +149,24 @@ async def update_employee(
     """
     Update a employee's profile.
     """
+    previous = None
+    if settings.STATELESS_AUTH:
+        previous = await employee_service.get_by_id(employee_id=employee_id)
     employee = await employee_service.update(
         employee_id=employee_id, employee_in=employee_in
     )
     if not employee:
         return JSONResponse(status_code=404, content={"detail": "No employee found"})
-
-    await send_updated_personal_information(
+    deps.employee_principal_cache.invalidate(employee_id)
+    # Stateless tokens carry role and is_active; only a change to them revokes.
+    if settings.STATELESS_AUTH and (
+        not previous
+        or any(previous[claim] != employee[claim] for claim in ("role", "is_active"))
+    ):
+        await token_revocations.revoke(employee_id)
+
+    notification_outbox.enqueue(
+        send_updated_personal_information,
         email_to=employee["email"],
     )
 
@@ -195,10 +210,14 @@ async def get_employee_by_id(
 )
 async def get_all(
     *,
+    response: Response,
     query_args: EmployeeQueryParams = Depends(),
     current_employee: Employee = Depends(deps.get_current_active_employee),
 ):
     employees = await employee_service.get_all(query_args=query_args)
+    cursor = next_cursor(employees, limit=query_args.limit, key="identity_card")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     if employees:
         return employees
     return []
@@ -8,6 +8,7 @@ from starlette.responses import JSONResponse
 from app.api import deps
 from app.core import security
 from app.core.config import Settings, get_settings
+from app.infra.smtp.exceptions import PermanentDeliveryError
 from app.schemas.owner_token import CreateOwnerToken
 from app.schemas.token import Token
 from app.services.auth import auth_service
@@ -37,10 +38,20 @@ async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()) -
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not employee.is_active:
         raise HTTPException(status_code=400, detail="Inactive employee")
+    claims = None
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    if settings.STATELESS_AUTH:
+        claims = {
+            "role": employee.role.value,
+            "is_active": employee.is_active,
+            "ver": await security.token_revocations.current(employee.identity_card),
+        }
+        access_token_expires = timedelta(
+            minutes=settings.STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES
+        )
     return {
         "access_token": security.create_access_token(
-            employee.identity_card, expires_delta=access_token_expires
+            employee.identity_card, expires_delta=access_token_expires, claims=claims
         ),
         "token_type": "bearer",
     }
@@ -82,10 +93,13 @@ async def owner_access_token(identity_card: str) -> Any:
 
     # Enviar correo/mensaje con el código
 
-    flag = await send_code_email(
-        email_to=owner.email,
-        code=code,
-    )
+    try:
+        flag = await send_code_email(
+            email_to=owner.email,
+            code=code,
+        )
+    except PermanentDeliveryError:
+        flag = False
 
     if not flag:
         raise HTTPException(
@@ -1,15 +1,21 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from app.api import deps
 from app.core.config import Settings, get_settings
+from app.schemas.batch import BatchItemResult
 from app.schemas.employee import Employee
 from app.schemas.owner import BaseOwner, CreateOwner, Owner, UpdateOwner
+from app.schemas.owner_summary import OwnerVehicleSummary
 from app.schemas.search import OwnerQueryParams
 from app.schemas.vehicle import Vehicle
+from app.services.notification import notification_outbox
 from app.services.owner import owner_service
+from app.utils.batch import check_batch_size, create_batch
+from app.utils.export import ExportFormat, export_response, iter_pages
+from app.utils.pagination import NEXT_CURSOR_HEADER, backend_params, next_cursor
 from app.utils.send_email import send_new_owner, send_updated_personal_information
 
 settings: Settings = get_settings()
@@ -52,7 +58,8 @@ async def create(
     owner = await owner_service.create(owner_in=owner)
 
     if owner_in.email:
-        await send_new_owner(
+        notification_outbox.enqueue(
+            send_new_owner,
             email_to=owner_in.email,
             identity_card=owner_in.identity_card,
             name=owner_in.names,
@@ -62,6 +69,58 @@ async def create(
     return owner
 
 
+@router.post(
+    "/batch",
+    response_class=JSONResponse,
+    response_model=List[BatchItemResult],
+    status_code=207,
+    responses={
+        207: {"description": "Owners processed, see each item's status"},
+        400: {"description": "Ids repeated in the batch"},
+        401: {"description": "User unauthorized"},
+        413: {"description": "Batch too large"},
+    },
+)
+async def create_owners(
+    *,
+    owners_in: List[BaseOwner],
+    current_employee: Employee = Depends(deps.get_current_techician),
+) -> List[BatchItemResult]:
+    """
+    Create many owners at once.
+    """
+    check_batch_size(owners_in)
+
+    async def create(index: int) -> Optional[Owner]:
+        owner = CreateOwner(
+            creation_employee_id=current_employee["identity_card"],
+            update_employee_id=current_employee["identity_card"],
+            **owners_in[index].dict(),
+        )
+        return await owner_service.create(owner_in=owner)
+
+    results = await create_batch(
+        [owner_in.identity_card for owner_in in owners_in],
+        exists=lambda owner_id: owner_service.get_by_id(owner_id=owner_id),
+        create=create,
+    )
+    notification_outbox.enqueue_many(
+        send_new_owner,
+        [
+            {
+                "email_to": owner_in.email,
+                "identity_card": owner_in.identity_card,
+                "name": owner_in.names,
+                "surname": owner_in.surnames,
+                "phone": owner_in.phone,
+            }
+            for owner_in, result in zip(owners_in, results)
+            if result["status"] == 201 and owner_in.email
+        ],
+    )
+    return results
+
+
 @router.get(
     "/me",
     response_class=JSONResponse,
@@ -84,6 +143,27 @@ async def get_profile(
     return owner
 
 
+@router.get(
+    "/me/summary",
+    response_class=JSONResponse,
+    response_model=List[OwnerVehicleSummary],
+    status_code=200,
+    responses={
+        200: {"description": "Owner summary found"},
+        401: {"description": "User unauthorized"},
+    },
+)
+async def get_summary(
+    *,
+    current_owner: Owner = Depends(deps.get_current_owner),
+) -> Any:
+    """
+    Gets owner's vehicles with their reparation details.
+    """
+    summary = await owner_service.get_summary(owner_id=current_owner["identity_card"])
+    return summary
+
+
 @router.get(
     "/vehicles",
     response_class=JSONResponse,
@@ -108,6 +188,32 @@ async def get_owners_vehicles(
     return vehicles
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"description": "Owners exported"},
+        401: {"description": "User unauthorized"},
+    },
+)
+async def export_owners(
+    *,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    query_args: OwnerQueryParams = Depends(),
+    current_employee: Employee = Depends(deps.get_current_active_employee),
+) -> StreamingResponse:
+    """
+    Streams every owner matching the filters as NDJSON or CSV.
+    """
+    pages = iter_pages(
+        owner_service.get_page,
+        params=backend_params(query_args.__dict__),
+        key="identity_card",
+    )
+    return export_response(pages, export_format=export_format, filename="owners")
+
+
 @router.get(
     "/{owner_id}",
     response_class=JSONResponse,
@@ -145,10 +251,14 @@ async def get_owner_by_id(
 )
 async def get_all(
     *,
+    response: Response,
     query_args: OwnerQueryParams = Depends(),
     current_employee: Employee = Depends(deps.get_current_active_employee),
 ):
     owners = await owner_service.get_all(query_args=query_args)
+    cursor = next_cursor(owners, limit=query_args.limit, key="identity_card")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     if owners:
         return owners
     return []
@@ -177,7 +287,9 @@ async def update_owner(
     owner = await owner_service.update(owner_id=owner_id, owner_in=owner_in)
     if not owner:
         return JSONResponse(status_code=404, content={"detail": "No owner found"})
-    await send_updated_personal_information(
+    deps.owner_principal_cache.invalidate(owner_id)
+    notification_outbox.enqueue(
+        send_updated_personal_information,
         email_to=owner["email"],
     )
     return owner
@@ -2,7 +2,7 @@ from typing import List, Optional
 
 from fastapi import APIRouter, Depends
 from fastapi.exceptions import HTTPException
-from starlette.responses import JSONResponse, Response
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from app.api import deps
 from app.schemas.employee import Employee
@@ -12,9 +12,12 @@ from app.schemas.reparation_detail import (
     ReparationDetail,
     UpdateReparationDetail,
 )
+from app.schemas.search import ReparationDetailQueryParams
+from app.services.notification import notification_outbox, notify_vehicle_owners
 from app.services.reparation_details import reparation_detail_service
-from app.services.vehicle import vehicle_service
-from app.utils.send_email import send_reparation_detail
+from app.utils.export import ExportFormat, export_response, iter_pages
+from app.utils.pagination import backend_params
+from app.utils.send_email import send_bulk_reparation_detail
 
 # from app.schemas.vehicle import UpdateVehicle
 
@@ -48,17 +51,45 @@ async def create_reparation_detail(
     )
 
     if detail:
-        vehicle_owners = await vehicle_service.get_vehicle_owners(vehicle_id=vehicle_id)
-        for owner in vehicle_owners:
-            await send_reparation_detail(
-                email_to=owner["email"],
-                description=detail["description"],
-                cost=detail["cost"],
-            )
+        notification_outbox.enqueue(
+            notify_vehicle_owners,
+            vehicle_id=vehicle_id,
+            send_bulk=send_bulk_reparation_detail,
+            description=detail["description"],
+            cost=detail["cost"],
+        )
 
     return detail
 
 
+@router.get(
+    "/reparation-details/export",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"description": "Reparation details exported"},
+        401: {"description": "User unauthorized"},
+    },
+)
+async def export_reparation_details(
+    *,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    query_args: ReparationDetailQueryParams = Depends(),
+    current_employee: Employee = Depends(deps.get_current_active_employee),
+) -> StreamingResponse:
+    """
+    Streams every reparation detail matching the filters as NDJSON or CSV.
+    """
+    pages = iter_pages(
+        reparation_detail_service.get_page,
+        params=backend_params(query_args.__dict__),
+        key="id",
+    )
+    return export_response(
+        pages, export_format=export_format, filename="reparation_details"
+    )
+
+
 @router.get(
     "/vehicles/{vehicle_id}/reparation-details",
     response_class=JSONResponse,
@@ -196,7 +227,7 @@ async def remove(
     current_employee: Employee = Depends(deps.get_current_techician),
 ):
     vehicle_x_owner_remove = await reparation_detail_service.delete_by_id(
-        reparation_id=reparation_id
+        reparation_id=reparation_id, vehicle_id=vehicle_id
     )
     status_code = 204 if vehicle_x_owner_remove == 1 else 404
     if status_code == 404:
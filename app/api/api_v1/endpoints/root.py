@@ -1,9 +1,19 @@
 from enum import Enum
+from typing import Any, Dict
 
 from fastapi import APIRouter, status
 from pydantic import BaseModel, Field
 
+from app.api import deps
+from app.core.batch_loader import batch_loaders
+from app.core.cache import entity_caches
 from app.core.config import Settings, get_settings
+from app.core.security import password_hasher
+from app.core.shared_cache import shared_cache
+from app.infra.httpx.client import HTTPXClient
+from app.infra.smtp.client import smtp_client
+from app.services.notification import notification_outbox
+from app.services.owner_summary import owner_summary_cache
 
 router = APIRouter()
 
@@ -40,3 +50,29 @@ def health_check():
         "status": StatusEnum.OK,
         "expire_time": settings.ACCESS_TOKEN_EXPIRE_MINUTES,
     }
+
+
+@router.get(
+    "/status/metrics",
+    response_model=Dict[str, Any],
+    status_code=status.HTTP_200_OK,
+    tags=["Health Check"],
+    summary="Returns runtime metrics",
+    description="Returns counters of the worker's pools, queues and caches.",
+)
+def metrics():
+    return {
+        "password_hasher": password_hasher.stats(),
+        "httpx_client": HTTPXClient.stats(),
+        "employee_principal_cache": deps.employee_principal_cache.stats(),
+        "owner_principal_cache": deps.owner_principal_cache.stats(),
+        "token_cache": deps.token_cache.stats(),
+        "owner_summary_cache": owner_summary_cache.stats(),
+        "smtp_client": smtp_client.stats(),
+        "notification_outbox": notification_outbox.stats(),
+        "entity_caches": {name: cache.stats() for name, cache in entity_caches.items()},
+        "shared_cache": shared_cache.stats(),
+        "batch_loaders": {
+            name: loader.stats() for name, loader in batch_loaders.items()
+        },
+    }
@@ -1,20 +1,49 @@
-from typing import List, Optional
+import asyncio
+import logging
+from typing import Any, Awaitable, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
 
 from app.api import deps
+from app.core.config import Settings, get_settings
+from app.core.deadline import DeadlineExceededError
+from app.infra.httpx.exceptions import BackendUnavailableError
+from app.schemas.batch import BatchItemResult
 from app.schemas.employee import Employee
 from app.schemas.owner import Owner
 from app.schemas.search import VehicleQueryParams
 from app.schemas.vehicle import BaseVehicle, CreateVehicle, UpdateVehicle, Vehicle
+from app.schemas.vehicle_dossier import VehicleDossier
 from app.schemas.vehicle_x_owner import VehicleXOwner
+from app.services.concurrency import gather_or_cancel
+from app.services.notification import notification_outbox, notify_vehicle_owners
 from app.services.owner import owner_service
+from app.services.reparation_details import reparation_detail_service
 from app.services.vehicle import vehicle_service
-from app.utils.send_email import send_assigned_vehicle, send_updated_vehicle
+from app.utils.batch import check_batch_size, create_batch
+from app.utils.export import ExportFormat, export_response, iter_pages
+from app.utils.pagination import NEXT_CURSOR_HEADER, backend_params, next_cursor
+from app.utils.send_email import send_assigned_vehicle, send_bulk_updated_vehicle
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
 
 router = APIRouter()
 
+MISSING = object()
+
+
+async def _dossier_part(name: str, part: Awaitable[Any]) -> Any:
+    try:
+        return await asyncio.wait_for(
+            part, timeout=settings.DOSSIER_PART_TIMEOUT_SECONDS
+        )
+    except (asyncio.TimeoutError, BackendUnavailableError, DeadlineExceededError) as e:
+        log.error(f"Dossier part {name} unavailable: {e!r}")
+        return MISSING
+
 
 @router.post(
     "",
@@ -51,6 +80,69 @@ async def create_vehicle(
     return vehicle
 
 
+@router.post(
+    "/batch",
+    response_class=JSONResponse,
+    response_model=List[BatchItemResult],
+    status_code=207,
+    responses={
+        207: {"description": "Vehicles processed, see each item's status"},
+        400: {"description": "Ids repeated in the batch"},
+        401: {"description": "User unauthorized"},
+        413: {"description": "Batch too large"},
+    },
+)
+async def create_vehicles(
+    *,
+    vehicles_in: List[BaseVehicle],
+    current_employee: Employee = Depends(deps.get_current_techician),
+) -> List[BatchItemResult]:
+    """
+    Create many vehicles at once.
+    """
+    check_batch_size(vehicles_in)
+
+    async def create(index: int) -> Optional[Vehicle]:
+        vehicle = CreateVehicle(
+            creation_employee_id=current_employee["identity_card"],
+            update_employee_id=current_employee["identity_card"],
+            **vehicles_in[index].dict(),
+        )
+        return await vehicle_service.create(vehicle_in=vehicle)
+
+    return await create_batch(
+        [vehicle_in.plate for vehicle_in in vehicles_in],
+        exists=lambda plate: vehicle_service.get_by_plate(vehicle_id=plate),
+        create=create,
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    status_code=200,
+    responses={
+        200: {"description": "Vehicles exported"},
+        401: {"description": "User unauthorized"},
+    },
+)
+async def export_vehicles(
+    *,
+    export_format: ExportFormat = ExportFormat.ndjson,
+    query_args: VehicleQueryParams = Depends(),
+    current_employee: Employee = Depends(deps.get_current_active_employee),
+) -> StreamingResponse:
+    """
+    Streams every vehicle matching the filters as NDJSON or CSV.
+    """
+    pages = iter_pages(
+        vehicle_service.get_page,
+        params=backend_params(query_args.__dict__),
+        key="plate",
+    )
+    return export_response(pages, export_format=export_format, filename="vehicles")
+
+
 @router.get(
     "/{vehicle_id}",
     response_class=JSONResponse,
@@ -88,15 +180,62 @@ async def get_vehicle_by_id(
 )
 async def get_all(
     *,
+    response: Response,
     query_args: VehicleQueryParams = Depends(),
     current_employee: Employee = Depends(deps.get_current_active_employee),
 ) -> Optional[List[Vehicle]]:
     vehicles = await vehicle_service.get_all(query_args=query_args)
+    cursor = next_cursor(vehicles, limit=query_args.limit, key="plate")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     if vehicles:
         return vehicles
     return []
 
 
+@router.get(
+    "/{vehicle_id}/dossier",
+    response_class=JSONResponse,
+    response_model=VehicleDossier,
+    status_code=200,
+    responses={
+        200: {"description": "Vehicle dossier found, possibly partial"},
+        401: {"description": "User unauthorized"},
+        404: {"description": "Vehicle not found"},
+    },
+)
+async def get_vehicle_dossier(
+    *,
+    vehicle_id: str,
+    current_employee: Employee = Depends(deps.get_current_active_employee),
+) -> VehicleDossier:
+    """
+    Gets the vehicle with its owners and reparation details in one document.
+    Parts that time out are left empty and listed in "missing".
+    """
+    vehicle, owners, reparation_details = await asyncio.gather(
+        _dossier_part("vehicle", vehicle_service.get_by_plate(vehicle_id=vehicle_id)),
+        _dossier_part(
+            "owners", vehicle_service.get_vehicle_owners(vehicle_id=vehicle_id)
+        ),
+        _dossier_part(
+            "reparation_details",
+            reparation_detail_service.get_by_vehicle(vehicle_id=vehicle_id),
+        ),
+    )
+    if vehicle is None:
+        return JSONResponse(status_code=404, content={"detail": "No vehicle found"})
+    parts = {
+        "vehicle": vehicle,
+        "owners": owners,
+        "reparation_details": reparation_details,
+    }
+    return {
+        **{name: None if part is MISSING else part for name, part in parts.items()},
+        "missing": [name for name, part in parts.items() if part is MISSING],
+    }
+
+
 @router.get(
     "/{vehicle_id}/owners",
     response_class=JSONResponse,
@@ -148,12 +287,11 @@ async def update_vehicle(
     if not vehicle:
         return JSONResponse(status_code=404, content={"detail": "No vehicle found"})
 
-    vehicle_owners = await vehicle_service.get_vehicle_owners(vehicle_id=vehicle_id)
-    if vehicle_owners:
-        for owner in vehicle_owners:
-            await send_updated_vehicle(
-                email_to=owner["email"],
-            )
+    notification_outbox.enqueue(
+        notify_vehicle_owners,
+        vehicle_id=vehicle_id,
+        send_bulk=send_bulk_updated_vehicle,
+    )
     return vehicle
 
 
@@ -177,11 +315,13 @@ async def create_owner_vehicle(
     Create new owner vehicle.
     """
 
-    vehicle = await vehicle_service.get_by_plate(vehicle_id=vehicle_id)
+    vehicle, owner = await gather_or_cancel(
+        vehicle_service.get_by_plate(vehicle_id=vehicle_id),
+        owner_service.get_by_id(owner_id=owner_id),
+    )
     if not vehicle:
         return JSONResponse(status_code=404, content={"detail": "No vehicle found"})
 
-    owner = await owner_service.get_by_id(owner_id=owner_id)
     if not owner:
         return JSONResponse(status_code=404, content={"detail": "No owner found"})
 
@@ -189,7 +329,8 @@ async def create_owner_vehicle(
         vehicle_id=vehicle_id, owner_id=owner_id
     )
     if vehicle_owner:
-        await send_assigned_vehicle(
+        notification_outbox.enqueue(
+            send_assigned_vehicle,
             email_to=owner["email"],
             plate=vehicle["plate"],
             brand=vehicle["brand"],
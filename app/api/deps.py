@@ -1,9 +1,16 @@
+import hashlib
+import time
+from typing import Type
+
 from fastapi import Header, HTTPException, Security, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
 
+from app.core.cache import TTLCache
 from app.core.config import Settings, get_settings
+from app.core.security import token_revocations
+from app.core.shared_cache import shared_cache
 from app.schemas.employee import Employee
 from app.schemas.owner import Owner
 from app.schemas.token import OwnerTokenPayload, TokenPayload
@@ -15,42 +22,80 @@ settings: Settings = get_settings()
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/login/access-token")
 not_reusable_oauth2 = OAuth2PasswordBearer(tokenUrl="/api/v1/owners/access-token")
 
-
-async def get_current_owner(
-    token: str = Header(...),
-) -> Owner:
+employee_principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+owner_principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_MAXSIZE, ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE, ttl=settings.TOKEN_CACHE_TTL_SECONDS
+)
+# Principals are entities; drop them when another worker writes the entity.
+shared_cache.subscribe("employee", employee_principal_cache.invalidate)
+shared_cache.subscribe("owner", owner_principal_cache.invalidate)
+
+
+def decode_token(token: str, schema: Type[TokenPayload]) -> TokenPayload:
+    key = (schema.__name__, hashlib.sha256(token.encode()).hexdigest())
+    token_data = token_cache.get(key)
+    if token_data is not None:
+        return token_data
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
-        token_data = OwnerTokenPayload(**payload)
+        token_data = schema(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    owner = await owner_service.get_by_id(owner_id=token_data.sub)
-    if not owner:
-        raise HTTPException(status_code=404, detail="Owner not found")
+    ttl = settings.TOKEN_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    token_cache.set(key, token_data, ttl=ttl)
+    return token_data
+
+
+async def get_current_owner(
+    token: str = Header(...),
+) -> Owner:
+    token_data = decode_token(token, OwnerTokenPayload)
+    owner = owner_principal_cache.get(token_data.sub)
+    if owner is None:
+        owner = await owner_service.get_by_id(owner_id=token_data.sub)
+        if not owner:
+            raise HTTPException(status_code=404, detail="Owner not found")
+        owner_principal_cache.set(token_data.sub, owner)
+    else:
+        owner_service.cache.remember(token_data.sub, owner)
     return owner
 
 
 async def get_current_employee(
     token: str = Security(reusable_oauth2),
 ) -> Employee:
-    try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
-        token_data = TokenPayload(**payload)
-    except (jwt.JWTError, ValidationError):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Could not validate credentials",
-        )
-    employee = await employee_service.get_by_id(employee_id=token_data.sub)
-    if not employee:
-        raise HTTPException(status_code=404, detail="Employee not found")
+    token_data = decode_token(token, TokenPayload)
+    if settings.STATELESS_AUTH and token_data.role is not None:
+        if await token_revocations.is_revoked(token_data.sub, token_data.ver):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Could not validate credentials",
+            )
+        return {
+            "identity_card": token_data.sub,
+            "role": token_data.role,
+            "is_active": token_data.is_active,
+        }
+    employee = employee_principal_cache.get(token_data.sub)
+    if employee is None:
+        employee = await employee_service.get_by_id(employee_id=token_data.sub)
+        if not employee:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        employee_principal_cache.set(token_data.sub, employee)
+    else:
+        employee_service.cache.remember(token_data.sub, employee)
     return employee
 
 
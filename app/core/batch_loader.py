@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.core import deadline, identity_map
+
+batch_loaders: Dict[str, "BatchLoader"] = {}
+
+
+class BatchLoader:
+    """
+    Collects the keys requested within ``window`` seconds, across requests, and
+    resolves them together: through ``load_many`` in chunks of ``max_batch``
+    when the backend has a bulk lookup. Each caller gets the result for its
+    own key, or None. Without ``load_many`` there is nothing to batch, so keys
+    go straight to ``load_one`` without waiting for the window.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        load_one: Callable[[Hashable], Awaitable[Any]],
+        load_many: Optional[
+            Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]]
+        ] = None,
+        window: float,
+        max_batch: int,
+    ):
+        self.name = name
+        self.load_one = load_one
+        self.load_many = load_many
+        self.window = window
+        self.max_batch = max_batch
+        self.loads = 0
+        self.batches = 0
+        self._pending: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._scheduled = False
+        batch_loaders[name] = self
+
+    async def load(self, key: Hashable) -> Any:
+        self.loads += 1
+        if self.load_many is None:
+            return await self.load_one(key)
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_event_loop()
+            future = loop.create_future()
+            # Mark the error as retrieved even if every caller went away.
+            future.add_done_callback(lambda f: f.cancelled() or f.exception())
+            self._pending[key] = future
+            if not self._scheduled:
+                self._scheduled = True
+                loop.call_later(self.window, self._dispatch)
+        left = deadline.remaining()
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout=left)
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceededError(
+                f"{self.name} lookup ran out of the request deadline"
+            )
+
+    def _dispatch(self) -> None:
+        pending, self._pending = self._pending, {}
+        self._scheduled = False
+        chunk: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        for key, future in pending.items():
+            chunk[key] = future
+            if len(chunk) == self.max_batch:
+                asyncio.ensure_future(self._resolve(chunk))
+                chunk = {}
+        if chunk:
+            asyncio.ensure_future(self._resolve(chunk))
+
+    async def _resolve(self, futures: Dict[Hashable, "asyncio.Future[Any]"]) -> None:
+        # A batch serves many requests; don't run it under the first one's
+        # budget nor its identity map.
+        deadline.set_deadline(None)
+        identity_map.set_scope(None)
+        self.batches += 1
+        try:
+            found = await self.load_many(list(futures))
+        except BaseException as e:
+            for future in futures.values():
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "loads": self.loads,
+            "batches": self.batches,
+            "pending": len(self._pending),
+            "bulk": self.load_many is not None,
+        }
@@ -0,0 +1,291 @@
+import asyncio
+import logging
+import math
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, Type
+
+from app.core import deadline, degraded, identity_map
+from app.core.shared_cache import SharedCache
+
+log = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire ``ttl`` seconds after being
+    stored.
+    """
+
+    def __init__(self, *, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def peek(self, key: Hashable) -> Any:
+        """Like get, without counting or refreshing the key."""
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def invalidate(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def keys(self) -> List[Hashable]:
+        return list(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+entity_caches: Dict[str, "ReadThroughCache"] = {}
+
+
+class ReadThroughCache:
+    """
+    TTL+LRU cache in front of an async loader. Found entities are cached for
+    ``ttl`` seconds; with a ``negative_ttl``, keys the loader didn't find are
+    remembered apart for that (short) time so repeated misses skip the backend.
+    Services invalidate keys after writing or creating them, and a load that
+    started before an invalidation is not stored.
+
+    The request's identity map is consulted first and filled on every found
+    entity, so a request sees one copy of each entity however often it asks;
+    invalidating or clearing drops them from it too.
+
+    ``ttl`` is a soft TTL: for ``stale_ttl`` more seconds the entry is still
+    served at once while a single background refresh reloads it. With an
+    ``early_expiry_beta``, refreshes also start at random shortly before the
+    soft TTL, earlier for entries that were slow to load (XFetch), so a hot
+    key doesn't expire for every caller at the same moment.
+
+    When the loader raises one of ``fallback_on``, the last value loaded for
+    the key within ``last_good_ttl`` seconds is served instead and the request
+    is marked as degraded.
+
+    With a ``shared`` cache, entities missing from this worker's cache are
+    looked up there before the loader runs and kept here for no longer than
+    they have left there, loaded ones are written there, and invalidations
+    reach the other workers' caches through it.
+    """
+
+    def __init__(
+        self,
+        *,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float = 0,
+        stale_ttl: float = 0,
+        early_expiry_beta: float = 0,
+        fallback_on: Tuple[Type[Exception], ...] = (),
+        last_good_ttl: float = 0,
+        shared: Optional[SharedCache] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.early_expiry_beta = early_expiry_beta
+        self.stale_served = 0
+        self.early_refreshes = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.fallback_on = fallback_on
+        self.degraded_served = 0
+        self._last_good = TTLCache(maxsize=maxsize, ttl=last_good_ttl)
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self._missing = TTLCache(maxsize=maxsize, ttl=negative_ttl)
+        self._refreshing: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self._generation = 0
+        self.shared = shared
+        if shared is not None:
+            shared.subscribe(name, self._drop_local)
+        entity_caches[name] = self
+
+    async def get_or_load(
+        self, key: Hashable, loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        value = identity_map.get((self.name, key))
+        if value is not None:
+            return value
+        entry = self._cache.get(key)
+        if entry is None:
+            if self.negative_ttl and self._missing.get(key):
+                return None
+            value = await self._get_shared(key)
+            if value is None:
+                try:
+                    value = await self._load(key, loader)
+                except self.fallback_on:
+                    value = self._last_good.get(key)
+                    if value is None:
+                        raise
+                    self.degraded_served += 1
+                    degraded.mark(self.name)
+                if not value:
+                    return value
+        else:
+            fresh_until, load_time, value = entry
+            if self._should_refresh(fresh_until, load_time):
+                self._refresh(key, loader)
+        self.remember(key, value)
+        return value
+
+    async def _get_shared(self, key: Hashable) -> Any:
+        if not self.shared:
+            return None
+        generation = self._generation
+        value, remaining = await self.shared.get(self.name, key)
+        # Keep it no longer than the shared copy lives.
+        if value is not None and generation == self._generation:
+            self._store(key, value, load_time=0, ttl=remaining)
+        return value
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        generation = self._generation
+        started = time.monotonic()
+        value = await loader()
+        if generation != self._generation:
+            return value
+        if value:
+            self._store(key, value, load_time=time.monotonic() - started)
+            if self.shared:
+                await self.shared.set(self.name, key, value, ttl=self.ttl)
+        else:
+            self._cache.invalidate(key)
+            if self.negative_ttl:
+                self._missing.set(key, True)
+        return value
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        *,
+        load_time: float,
+        ttl: Optional[float] = None,
+    ) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._cache.set(
+            key, (time.monotonic() + ttl, load_time, value), ttl=ttl + self.stale_ttl
+        )
+        if self.fallback_on and self._last_good.ttl:
+            self._last_good.set(key, value)
+
+    def _should_refresh(self, fresh_until: float, load_time: float) -> bool:
+        now = time.monotonic()
+        if now >= fresh_until:
+            self.stale_served += 1
+            return True
+        if self.early_expiry_beta and load_time:
+            early = (
+                -load_time * self.early_expiry_beta * math.log(1.0 - random.random())
+            )
+            if now + early >= fresh_until:
+                self.early_refreshes += 1
+                return True
+        return False
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self.refreshes += 1
+
+        async def refresh() -> None:
+            # Runs past the request that triggered it; don't inherit its
+            # budget nor its identity map.
+            deadline.set_deadline(None)
+            identity_map.set_scope(None)
+            try:
+                await self._load(key, loader)
+            except Exception as e:
+                self.refresh_failures += 1
+                log.error(f"Refreshing {self.name} {key} failed: {e!r}")
+            finally:
+                del self._refreshing[key]
+
+        self._refreshing[key] = asyncio.ensure_future(refresh())
+
+    def remember(self, key: Hashable, value: Any) -> None:
+        identity_map.put((self.name, key), value)
+
+    async def invalidate(self, key: Hashable) -> None:
+        self._generation += 1
+        self._cache.invalidate(key)
+        self._missing.invalidate(key)
+        self._last_good.invalidate(key)
+        identity_map.discard((self.name, key))
+        if self.shared:
+            await self.shared.invalidate(self.name, key)
+
+    async def clear(self) -> None:
+        self._clear_local()
+        if self.shared:
+            await self.shared.clear(self.name)
+
+    def _clear_local(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+        self._missing.clear()
+        self._last_good.clear()
+        identity_map.discard_namespace(self.name)
+
+    def _drop_local(self, key: Optional[str]) -> None:
+        # Another worker invalidated the key, which arrives as a string.
+        if key is None:
+            self._clear_local()
+            return
+        self._generation += 1
+        for cache in (self._cache, self._missing, self._last_good):
+            for local_key in cache.keys():
+                if str(local_key) == key:
+                    cache.invalidate(local_key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._cache.stats(),
+            "negative": self._missing.stats(),
+            "stale_served": self.stale_served,
+            "early_refreshes": self.early_refreshes,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "refreshing": len(self._refreshing),
+            "degraded_served": self.degraded_served,
+        }
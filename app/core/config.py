@@ -1,7 +1,8 @@
 import logging
 from functools import lru_cache
+from typing import Dict, Optional
 
-from pydantic import AnyUrl, BaseSettings
+from pydantic import AnyUrl, BaseSettings, root_validator
 
 log = logging.getLogger(__name__)
 
@@ -13,12 +14,67 @@ class Settings(BaseSettings):
     WEB_APP_VERSION: str
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 8
+    REQUEST_DEADLINE_SECONDS: float = 10.0
+    REQUEST_DEADLINE_OVERRIDES: Dict[str, float] = {}
+    MAX_PAGE_SIZE: int = 100
+    DOSSIER_PART_TIMEOUT_SECONDS: float = 3.0
+    OWNER_SUMMARY_CONCURRENCY: int = 5
+    OWNER_SUMMARY_TTL_SECONDS: float = 10.0
+    OWNER_SUMMARY_CACHE_MAXSIZE: int = 1024
+    BATCH_CREATE_MAX_SIZE: int = 500
+    BATCH_CREATE_CONCURRENCY: int = 10
+    BACKEND_SUPPORTS_BULK_LOOKUP: bool = False
+    BATCH_LOADER_WINDOW_SECONDS: float = 0.002
+    BATCH_LOADER_MAX_BATCH: int = 100
+    STATELESS_AUTH: bool = False
+    STATELESS_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     ALGORITHM: str
     DATABASE_URL: AnyUrl
     SMTP_PASSWORD: str
     SMTP_USER: str
     SMTP_HOST: str
     SMTP_PORT: str
+    SMTP_POOL_SIZE: int = 4
+    SMTP_TIMEOUT: float = 30.0
+    EMAIL_TEMPLATES_DIR: str = "./app/email_templates"
+    EMAIL_TEMPLATES_AUTO_RELOAD: bool = False
+    NOTIFICATION_WORKERS: int = 2
+    NOTIFICATION_BATCH_SIZE: int = 10
+    NOTIFICATION_MAX_RETRIES: int = 3
+    NOTIFICATION_RETRY_BACKOFF_SECONDS: float = 1.0
+    NOTIFICATION_DEAD_LETTER_SIZE: int = 100
+    NOTIFICATION_DRAIN_TIMEOUT_SECONDS: float = 30.0
+    NOTIFICATION_FANOUT_CONCURRENCY: int = 8
+    HTTPX_MAX_CONNECTIONS: int = 100
+    HTTPX_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTPX_KEEPALIVE_EXPIRY: float = 30.0
+    BACKEND_RETRY_ATTEMPTS: int = 3
+    BACKEND_RETRY_BACKOFF_SECONDS: float = 0.1
+    BACKEND_BREAKER_FAILURE_THRESHOLD: int = 5
+    BACKEND_BREAKER_RECOVERY_SECONDS: float = 15.0
+    PASSWORD_HASH_WORKERS: int = 4
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 30.0
+    PRINCIPAL_CACHE_MAXSIZE: int = 1024
+    TOKEN_CACHE_TTL_SECONDS: float = 300.0
+    TOKEN_CACHE_MAXSIZE: int = 4096
+    ENTITY_CACHE_TTL_SECONDS: float = 30.0
+    ENTITY_CACHE_MAXSIZE: int = 2048
+    ENTITY_NEGATIVE_CACHE_TTL_SECONDS: float = 5.0
+    ENTITY_CACHE_STALE_SECONDS: float = 30.0
+    ENTITY_CACHE_EARLY_EXPIRY_BETA: float = 1.0
+    # 0 disables serving last known good entities during backend outages.
+    DEGRADED_MAX_STALENESS_SECONDS: float = 900.0
+    SHARED_CACHE_PATH: Optional[str] = None
+    SHARED_CACHE_POLL_SECONDS: float = 0.5
+    SHARED_CACHE_BUSY_TIMEOUT_SECONDS: float = 0.05
+    SHARED_CACHE_LOG_RETENTION_SECONDS: float = 300.0
+
+    @root_validator
+    def check_stateless_auth(cls, values):
+        # Token revocations must reach every worker and outlive restarts.
+        if values.get("STATELESS_AUTH") and not values.get("SHARED_CACHE_PATH"):
+            raise ValueError("STATELESS_AUTH requires SHARED_CACHE_PATH")
+        return values
 
 
 @lru_cache()
@@ -0,0 +1,85 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import Settings, get_settings
+
+settings: Settings = get_settings()
+
+# Route prefixes whose budget differs from REQUEST_DEADLINE_SECONDS; 0 disables
+# the deadline. The longest matching prefix wins.
+ROUTE_DEADLINES: Dict[str, float] = {
+    "/api/v1/login/access-token": 20.0,
+    "/api/v1/owners/access-token": 20.0,
+    "/api/v1/vehicles/export": 0,
+    "/api/v1/owners/export": 0,
+    "/api/v1/reparation-details/export": 0,
+    "/api/v1/vehicles/batch": 120.0,
+    "/api/v1/owners/batch": 120.0,
+}
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+class DeadlineExceededError(Exception):
+    """The request ran out of its time budget before the backend answered."""
+
+
+def budget_for(path: str) -> float:
+    routes = {**ROUTE_DEADLINES, **settings.REQUEST_DEADLINE_OVERRIDES}
+    # Whole segments only: /api/v1/vehicles/batchA1 is a plate, not the batch.
+    prefixes = [
+        prefix
+        for prefix in routes
+        if path == prefix or path.startswith(prefix.rstrip("/") + "/")
+    ]
+    if not prefixes:
+        return settings.REQUEST_DEADLINE_SECONDS
+    return routes[max(prefixes, key=len)]
+
+
+def set_deadline(seconds: Optional[float]) -> None:
+    _deadline.set(time.monotonic() + seconds if seconds else None)
+
+
+def remaining() -> Optional[float]:
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def timeout_for(timeout: float) -> float:
+    """
+    Clamps a per-call timeout to what is left of the request budget, raising
+    DeadlineExceededError once nothing is left.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceededError("Request deadline exceeded")
+    return min(timeout, left)
+
+
+class DeadlineMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        budget = budget_for(scope["path"])
+        token = _deadline.set(time.monotonic() + budget if budget else None)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _deadline.reset(token)
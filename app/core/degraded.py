@@ -0,0 +1,67 @@
+from contextvars import ContextVar
+from typing import Callable, Optional, Set
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+DEGRADED_HEADER = "X-Degraded"
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+_sources: ContextVar[Optional[Set[str]]] = ContextVar("degraded_sources", default=None)
+
+
+def mark(source: str) -> None:
+    """Records that the current request was answered with last-known-good data."""
+    sources = _sources.get()
+    if sources is not None:
+        sources.add(source)
+
+
+class DegradedModeMiddleware:
+    """
+    While ``is_unavailable()`` says the backend is down, writes are rejected at
+    once with 503 and reads go on, answered from the last known good cached
+    entities where needed. Responses that used such data carry the X-Degraded
+    header listing the caches they came from.
+    """
+
+    def __init__(
+        self, app: ASGIApp, *, is_unavailable: Callable[[], bool], retry_after: int
+    ):
+        self.app = app
+        self.is_unavailable = is_unavailable
+        self.retry_after = retry_after
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["method"] in WRITE_METHODS and self.is_unavailable():
+            response = JSONResponse(
+                status_code=503,
+                content={
+                    "detail": "The backend service is unavailable, try again later."
+                },
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+        sources: Set[str] = set()
+        token = _sources.set(sources)
+
+        async def send_marked(message: Message) -> None:
+            if message["type"] == "http.response.start" and sources:
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (
+                        DEGRADED_HEADER.lower().encode(),
+                        ",".join(sorted(sources)).encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_marked)
+        finally:
+            _sources.reset(token)
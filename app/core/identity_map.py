@@ -0,0 +1,59 @@
+from contextvars import ContextVar
+from typing import Any, Dict, Hashable, Optional
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+_identity_map: ContextVar[Optional[Dict[Hashable, Any]]] = ContextVar(
+    "identity_map", default=None
+)
+
+
+def get(key: Hashable) -> Any:
+    entities = _identity_map.get()
+    if entities is None:
+        return None
+    return entities.get(key)
+
+
+def put(key: Hashable, value: Any) -> None:
+    entities = _identity_map.get()
+    if entities is not None:
+        entities[key] = value
+
+
+def discard(key: Hashable) -> None:
+    entities = _identity_map.get()
+    if entities is not None:
+        entities.pop(key, None)
+
+
+def discard_namespace(namespace: Hashable) -> None:
+    """Drops every ``(namespace, key)`` entry."""
+    entities = _identity_map.get()
+    if entities is not None:
+        for key in [key for key in entities if key[0] == namespace]:
+            del entities[key]
+
+
+def set_scope(entities: Optional[Dict[Hashable, Any]]) -> None:
+    _identity_map.set(entities)
+
+
+class IdentityMapMiddleware:
+    """
+    Gives every HTTP request its own identity map, so an entity loaded through
+    a service cache is fetched at most once while the request lasts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _identity_map.set({})
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _identity_map.reset(token)
@@ -1,20 +1,134 @@
+import asyncio
 import random
 import string
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 from jose import jwt
 from passlib.context import CryptContext
 
 from app.core.config import Settings, get_settings
+from app.core.shared_cache import SharedCache, SharedCacheError, shared_cache
 
 settings: Settings = get_settings()
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a bounded thread pool so hashing never blocks the event loop.
+    Callers beyond ``max_workers`` wait on a semaphore; ``waiting`` is the
+    queue depth.
+    """
+
+    def __init__(self, *, max_workers: int):
+        self.max_workers = max_workers
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_event_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._loop = loop
+        return self._semaphore
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hasher"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        semaphore = self._get_semaphore()
+        self.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            semaphore.release()
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "waiting": self.waiting,
+            "running": self.running,
+            "completed": self.completed,
+        }
+
+
+password_hasher = PasswordHasher(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+
+class TokenRevocations:
+    """
+    Per-subject token versions. Only subjects that were ever revoked are kept, and
+    a token minted with an older version than the current one is rejected.
+
+    The versions live in the host's shared cache, so every worker checks and
+    bumps the same counter and they survive restarts for as long as a token
+    may. Without a shared cache (one worker, stateless auth off, which the
+    settings enforce) they are kept in this process.
+
+    Failing to read or bump a version raises SharedCacheError, and a token
+    whose version can't be checked counts as revoked.
+    """
+
+    NAMESPACE = "token_revocations"
+
+    def __init__(self, *, shared: SharedCache):
+        self._versions: Dict[str, int] = {}
+        self.shared = shared
+
+    async def current(self, subject: str) -> int:
+        if self.shared.enabled:
+            version, _ = await self.shared.get(self.NAMESPACE, subject, strict=True)
+            return version or 0
+        return self._versions.get(subject, 0)
+
+    async def revoke(self, subject: str) -> None:
+        if self.shared.enabled:
+            await self.shared.incr(
+                self.NAMESPACE, subject, ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+            )
+        else:
+            self._versions[subject] = self._versions.get(subject, 0) + 1
+
+    async def is_revoked(self, subject: str, version: Optional[int]) -> bool:
+        try:
+            return (version or 0) < await self.current(subject)
+        except SharedCacheError:
+            return True
+
+
+token_revocations = TokenRevocations(shared=shared_cache)
+
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any],
+    expires_delta: timedelta = None,
+    claims: Optional[Dict[str, Any]] = None,
 ) -> str:
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
@@ -22,7 +136,7 @@ def create_access_token(
         expire = datetime.utcnow() + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(
         to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
     )
@@ -37,6 +151,14 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def async_verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def async_get_password_hash(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+
 def get_random_alphanumeric_string(length):
     letters_and_digits = string.ascii_letters + string.digits
     result_str = "".join(random.choice(letters_and_digits) for i in range(length))
@@ -0,0 +1,325 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from app.core.config import Settings, get_settings
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
+
+T = TypeVar("T")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS invalidations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    key TEXT,
+    pid INTEGER NOT NULL,
+    at REAL NOT NULL
+);
+"""
+
+
+class SharedCacheError(Exception):
+    """A shared cache operation whose caller can't treat failure as a miss."""
+
+
+class SharedCache:
+    """
+    Cache tier shared by every worker process on the host, kept in a SQLite
+    file in WAL mode. Entries are compact JSON with an absolute expiry.
+
+    Invalidations are appended to a log that each worker polls every
+    ``poll_interval`` seconds, handing the keys invalidated by other workers to
+    the callbacks subscribed to their namespace so they drop them from their
+    in-process caches. Disabled when ``path`` is empty. A locked or broken file
+    is logged and treated as a miss, except by strict reads and ``incr``, which
+    raise SharedCacheError.
+
+    Every SQLite call runs on a single worker thread, off the event loop, and
+    in the order it was made.
+    """
+
+    def __init__(
+        self,
+        *,
+        path: Optional[str],
+        poll_interval: float,
+        busy_timeout: float,
+        log_retention: float,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.busy_timeout = busy_timeout
+        self.log_retention = log_retention
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.invalidations_applied = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._last_seen = 0
+        self._subscribers: Dict[str, List[Callable[[Optional[str]], None]]] = {}
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.path)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Reconnect in workers forked after the connection was opened.
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            (last_seen,) = connection.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM invalidations"
+            ).fetchone()
+            self._connection = connection
+            self._pid = os.getpid()
+            self._last_seen = last_seen
+        return self._connection
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # A forked worker doesn't inherit the parent's thread.
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="shared-cache"
+            )
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        return self._connect().execute(sql, params).fetchall()
+
+    async def get(
+        self, namespace: str, key: Any, *, strict: bool = False
+    ) -> Tuple[Any, float]:
+        """
+        The value and the seconds it has left; ``(None, 0)`` on a miss. A failed
+        read is a miss too, unless ``strict``.
+        """
+        if not self.enabled:
+            return None, 0
+        return await self._run(self._get, namespace, key, strict)
+
+    def _get(self, namespace: str, key: Any, strict: bool) -> Tuple[Any, float]:
+        try:
+            now = time.time()
+            rows = self._execute(
+                "SELECT value, expires_at FROM entries"
+                " WHERE namespace = ? AND key = ? AND expires_at > ?",
+                (namespace, str(key), now),
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache read failed: {e!r}")
+            if strict:
+                raise SharedCacheError(f"Reading {namespace} {key} failed") from e
+            return None, 0
+        if not rows:
+            self.misses += 1
+            return None, 0
+        self.hits += 1
+        value, expires_at = rows[0]
+        return json.loads(value), expires_at - now
+
+    async def set(self, namespace: str, key: Any, value: Any, *, ttl: float) -> None:
+        if self.enabled:
+            await self._run(self._set, namespace, key, value, ttl)
+
+    def _set(self, namespace: str, key: Any, value: Any, ttl: float) -> None:
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                (
+                    namespace,
+                    str(key),
+                    time.time() + ttl,
+                    json.dumps(value, separators=(",", ":")),
+                ),
+            )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.errors += 1
+            log.error(f"Shared cache write failed: {e!r}")
+
+    async def incr(self, namespace: str, key: Any, *, ttl: float) -> int:
+        """
+        Atomically adds one to an integer entry (missing counts as 0). Raises
+        SharedCacheError when the write fails.
+        """
+        if not self.enabled:
+            raise SharedCacheError("The shared cache is disabled")
+        return await self._run(self._incr, namespace, key, ttl)
+
+    def _incr(self, namespace: str, key: Any, ttl: float) -> int:
+        try:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = connection.execute(
+                    "SELECT value FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, str(key)),
+                ).fetchall()
+                value = (json.loads(rows[0][0]) if rows else 0) + 1
+                connection.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                    (namespace, str(key), time.time() + ttl, json.dumps(value)),
+                )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache write failed: {e!r}")
+            raise SharedCacheError(f"Incrementing {namespace} {key} failed") from e
+        return value
+
+    async def notify(self, namespace: str, key: Optional[Any]) -> None:
+        if self.enabled:
+            await self._run(self._notify, namespace, key)
+
+    def _notify(self, namespace: str, key: Optional[Any]) -> None:
+        try:
+            self._execute(
+                "INSERT INTO invalidations (namespace, key, pid, at)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    namespace,
+                    None if key is None else str(key),
+                    os.getpid(),
+                    time.time(),
+                ),
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache invalidation failed: {e!r}")
+
+    async def invalidate(self, namespace: str, key: Any) -> None:
+        if self.enabled:
+            await self._run(self._invalidate, namespace, key)
+
+    def _invalidate(self, namespace: str, key: Any) -> None:
+        try:
+            self._execute(
+                "DELETE FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, str(key)),
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache invalidation failed: {e!r}")
+        self._notify(namespace, key)
+
+    async def clear(self, namespace: str) -> None:
+        if self.enabled:
+            await self._run(self._clear, namespace)
+
+    def _clear(self, namespace: str) -> None:
+        try:
+            self._execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache invalidation failed: {e!r}")
+        self._notify(namespace, None)
+
+    def subscribe(
+        self, namespace: str, callback: Callable[[Optional[str]], None]
+    ) -> None:
+        """``callback`` gets each key other workers invalidate, None on clear."""
+        self._subscribers.setdefault(namespace, []).append(callback)
+
+    async def sync(self) -> None:
+        """Applies other workers' invalidations and prunes expired rows."""
+        if not self.enabled:
+            return
+        for row_id, namespace, key, pid in await self._run(self._read_log):
+            self._last_seen = row_id
+            if pid == os.getpid():
+                continue
+            for callback in self._subscribers.get(namespace, []):
+                callback(key)
+            self.invalidations_applied += 1
+
+    def _read_log(self) -> List[Tuple[Any, ...]]:
+        try:
+            connection = self._connect()
+            rows = connection.execute(
+                "SELECT id, namespace, key, pid FROM invalidations"
+                " WHERE id > ? ORDER BY id",
+                (self._last_seen,),
+            ).fetchall()
+            now = time.time()
+            connection.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            connection.execute(
+                "DELETE FROM invalidations WHERE at < ?", (now - self.log_retention,)
+            )
+        except sqlite3.Error as e:
+            self.errors += 1
+            log.error(f"Shared cache sync failed: {e!r}")
+            return []
+        return rows
+
+    def start(self) -> None:
+        if not self.enabled or self._task is not None:
+            return
+        self._task = asyncio.ensure_future(self._poll())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._executor is not None:
+            await self._run(self._close)
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    async def _poll(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await self.sync()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "invalidations_applied": self.invalidations_applied,
+        }
+
+
+shared_cache = SharedCache(
+    path=settings.SHARED_CACHE_PATH,
+    poll_interval=settings.SHARED_CACHE_POLL_SECONDS,
+    busy_timeout=settings.SHARED_CACHE_BUSY_TIMEOUT_SECONDS,
+    log_retention=settings.SHARED_CACHE_LOG_RETENTION_SECONDS,
+)
@@ -0,0 +1,66 @@
+import time
+from typing import Any, Dict
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and fails fast until
+    ``recovery_timeout`` seconds have passed. Then a single probe is let through
+    (half-open): its success closes the circuit, its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, *, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+    def allow_request(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.recovery_timeout:
+                self.rejected += 1
+                return False
+            self.state = self.HALF_OPEN
+            self._probing = False
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self.rejected += 1
+                return False
+            self._probing = True
+        return True
+
+    def is_open(self) -> bool:
+        return (
+            self.state == self.OPEN
+            and time.monotonic() - self.opened_at < self.recovery_timeout
+        )
+
+    def release(self) -> None:
+        """Gives up a request that ended without telling anything about the host."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "rejected": self.rejected,
+        }
@@ -1,13 +1,155 @@
+import asyncio
+import functools
 import logging
-from typing import Any, Dict, Optional
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import urlsplit
 
+from httpx import Limits, RequestError, Response
 from httpx._client import AsyncClient, Auth
 from pydantic import AnyHttpUrl
 
+from app.core import deadline
+from app.core.config import Settings, get_settings
+from app.infra.httpx.circuit_breaker import CircuitBreaker
+from app.infra.httpx.exceptions import BackendUnavailableError
+
 log = logging.getLogger(__name__)
 
+settings: Settings = get_settings()
+
+
+def _freeze(values: Optional[Dict[str, Any]]) -> Optional[Tuple[Tuple[str, str], ...]]:
+    if not values:
+        return None
+    return tuple(sorted((str(key), str(value)) for key, value in values.items()))
+
+
+IDEMPOTENT_METHODS = {"GET", "PUT", "DELETE"}
+RETRYABLE_STATUS = {502, 503, 504}
+
 
 class HTTPXClient:
+    """
+    Every instance shares one pooled AsyncClient, opened on application startup
+    and closed on shutdown (or created lazily outside of the app lifespan).
+    Concurrent identical GETs share a single in-flight backend call; each
+    caller still waits on it under its own deadline.
+
+    Transport errors and 502/503/504 answers count against a per-host circuit
+    breaker; idempotent methods are retried with jittered backoff first. Other
+    statuses, 500 included, go back to the caller like any unexpected answer. When the backend
+    stays unavailable, BackendUnavailableError is raised instead of returning
+    None, which keeps meaning "not found / rejected".
+
+    Every call draws its timeout from the current request deadline and forwards
+    the remaining budget to the backend in the X-Request-Timeout header (ms).
+    """
+
+    _client: Optional[AsyncClient] = None
+    _breakers: Dict[str, CircuitBreaker] = {}
+    _in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+    requests = 0
+    collapsed = 0
+
+    @classmethod
+    def get_client(cls) -> AsyncClient:
+        if cls._client is None or cls._client.is_closed:
+            limits = Limits(
+                max_connections=settings.HTTPX_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTPX_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTPX_KEEPALIVE_EXPIRY,
+            )
+            cls._client = AsyncClient(limits=limits)
+        return cls._client
+
+    @classmethod
+    async def start(cls) -> None:
+        cls.get_client()
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._client is not None and not cls._client.is_closed:
+            await cls._client.aclose()
+        cls._client = None
+
+    @classmethod
+    def get_breaker(cls, url_service: str) -> CircuitBreaker:
+        host = urlsplit(str(url_service)).netloc
+        breaker = cls._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=settings.BACKEND_BREAKER_FAILURE_THRESHOLD,
+                recovery_timeout=settings.BACKEND_BREAKER_RECOVERY_SECONDS,
+            )
+            cls._breakers[host] = breaker
+        return breaker
+
+    @classmethod
+    def stats(cls) -> Dict[str, Any]:
+        return {
+            "get_requests": cls.requests,
+            "get_collapsed": cls.collapsed,
+            "get_in_flight": len(cls._in_flight),
+            "circuit_breakers": {
+                host: breaker.stats() for host, breaker in cls._breakers.items()
+            },
+        }
+
+    async def _send(
+        self, method: str, url_service: AnyHttpUrl, **kwargs: Any
+    ) -> Response:
+        breaker = self.get_breaker(url_service)
+        attempts = (
+            settings.BACKEND_RETRY_ATTEMPTS if method in IDEMPOTENT_METHODS else 1
+        )
+        for attempt in range(attempts):
+            timeout = deadline.timeout_for(kwargs["timeout"])
+            if not breaker.allow_request():
+                raise BackendUnavailableError(f"Circuit open for {url_service}")
+            headers = {
+                **(kwargs["headers"] or {}),
+                "X-Request-Timeout": str(int(timeout * 1000)),
+            }
+            settled = False
+            try:
+                response = await self.get_client().request(
+                    method,
+                    url_service,
+                    **{**kwargs, "timeout": timeout, "headers": headers},
+                )
+            except RequestError as e:
+                if deadline.expired():
+                    raise deadline.DeadlineExceededError(
+                        f"{method} {url_service} ran out of the request deadline"
+                    )
+                log.error(f"{method} {url_service} failed: {e!r}")
+                error: Optional[str] = repr(e)
+            else:
+                # A 500 is usually the request's own fault (bad input), not
+                # the host's; it mustn't open the breaker for everyone.
+                if response.status_code not in RETRYABLE_STATUS:
+                    breaker.record_success()
+                    settled = True
+                    return response
+                error = f"status {response.status_code}"
+            finally:
+                # Cancellation or our own deadline says nothing about the host;
+                # release a half-open probe so the next call can take it.
+                if not settled:
+                    breaker.release()
+            breaker.record_failure()
+            if attempt == attempts - 1:
+                break
+            backoff = random.uniform(
+                0, settings.BACKEND_RETRY_BACKOFF_SECONDS * 2 ** attempt
+            )
+            left = deadline.remaining()
+            if left is not None and backoff >= left:
+                break
+            await asyncio.sleep(backoff)
+        raise BackendUnavailableError(f"{method} {url_service} failed: {error}")
+
     async def get(
         self,
         *,
@@ -17,23 +159,92 @@ class HTTPXClient:
         auth: Optional[Auth] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
-        cookies: Optional[Dict[str, Any]] = None
+        cookies: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
+        HTTPXClient.requests += 1
+        call = functools.partial(
+            self._get,
+            url_service=url_service,
+            status_response=status_response,
+            timeout=timeout,
+            auth=auth,
+            params=params,
+            headers=headers,
+            cookies=cookies,
+        )
+        if auth is not None:
+            return await call()
 
+        key = (
+            str(url_service),
+            status_response,
+            _freeze(params),
+            _freeze(headers),
+            _freeze(cookies),
+        )
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            HTTPXClient.collapsed += 1
+            return await self._follow(in_flight, call)
+
+        in_flight = asyncio.ensure_future(call())
+        self._in_flight[key] = in_flight
+
+        def forget(future: "asyncio.Future[Any]") -> None:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+            if not future.cancelled():
+                # Mark the error as retrieved even if every awaiter went away.
+                future.exception()
+
+        in_flight.add_done_callback(forget)
+        return await asyncio.shield(in_flight)
+
+    async def _follow(
+        self, in_flight: "asyncio.Future[Any]", call: Callable[[], Awaitable[Any]]
+    ) -> Any:
         try:
-            async with AsyncClient() as client:
-                response = await client.get(
-                    url_service,
-                    params=params,
-                    headers=headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                    auth=auth,
-                )
-                json_response = (
-                    response.json() if response.status_code == status_response else None
-                )
-                return json_response
+            return await asyncio.wait_for(
+                asyncio.shield(in_flight), timeout=deadline.remaining()
+            )
+        except asyncio.TimeoutError:
+            raise deadline.DeadlineExceededError(
+                "Shared GET ran out of the request deadline"
+            )
+        except deadline.DeadlineExceededError:
+            # The leader ran out of its own budget; this caller may have more.
+            if deadline.expired():
+                raise
+            return await call()
+
+    async def _get(
+        self,
+        *,
+        url_service: AnyHttpUrl,
+        status_response: int,
+        timeout: float,
+        auth: Optional[Auth],
+        params: Optional[Dict[str, Any]],
+        headers: Optional[Dict[str, Any]],
+        cookies: Optional[Dict[str, Any]],
+    ) -> Optional[Dict[str, Any]]:
+
+        try:
+            response = await self._send(
+                "GET",
+                url_service,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                auth=auth,
+            )
+            json_response = (
+                response.json() if response.status_code == status_response else None
+            )
+            return json_response
+        except (BackendUnavailableError, deadline.DeadlineExceededError):
+            raise
         except Exception as e:
             log.error(e)
             return None
@@ -50,29 +261,31 @@ class HTTPXClient:
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
         cookies: Optional[Dict[str, Any]] = None,
-        xml: Optional[bool] = False
+        xml: Optional[bool] = False,
     ) -> Optional[Dict[str, Any]]:
 
         try:
-            async with AsyncClient() as client:
-                response = await client.post(
-                    url_service,
-                    params=params,
-                    json=body,
-                    data=data,
-                    headers=headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                    auth=auth,
-                )
-                if response.status_code == status_response:
-                    if xml:
-                        response = response.text
-                    else:
-                        response = response.json()
+            response = await self._send(
+                "POST",
+                url_service,
+                params=params,
+                json=body,
+                data=data,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                auth=auth,
+            )
+            if response.status_code == status_response:
+                if xml:
+                    response = response.text
                 else:
-                    response = None
-                return response
+                    response = response.json()
+            else:
+                response = None
+            return response
+        except (BackendUnavailableError, deadline.DeadlineExceededError):
+            raise
         except Exception as e:
             log.error(e)
             return None
@@ -88,26 +301,28 @@ class HTTPXClient:
         data: Optional[Dict[str, Any]] = None,
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
-        cookies: Optional[Dict[str, Any]] = None
+        cookies: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
 
         try:
-            async with AsyncClient() as client:
-                response = await client.put(
-                    url_service,
-                    params=params,
-                    json=body,
-                    data=data,
-                    headers=headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                    auth=auth,
-                )
+            response = await self._send(
+                "PUT",
+                url_service,
+                params=params,
+                json=body,
+                data=data,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                auth=auth,
+            )
 
-                json_response = (
-                    response.json() if response.status_code == status_response else None
-                )
-                return json_response
+            json_response = (
+                response.json() if response.status_code == status_response else None
+            )
+            return json_response
+        except (BackendUnavailableError, deadline.DeadlineExceededError):
+            raise
         except Exception as e:
             log.error(e)
             return None
@@ -121,21 +336,23 @@ class HTTPXClient:
         auth: Optional[Auth] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
-        cookies: Optional[Dict[str, Any]] = None
+        cookies: Optional[Dict[str, Any]] = None,
     ) -> Optional[int]:
 
         try:
-            async with AsyncClient() as client:
-                response = await client.delete(
-                    url_service,
-                    params=params,
-                    headers=headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                    auth=auth,
-                )
-                json_response = 1 if response.status_code == status_response else None
-                return json_response
+            response = await self._send(
+                "DELETE",
+                url_service,
+                params=params,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                auth=auth,
+            )
+            json_response = 1 if response.status_code == status_response else None
+            return json_response
+        except (BackendUnavailableError, deadline.DeadlineExceededError):
+            raise
         except Exception as e:
             log.error(e)
             return None
@@ -151,26 +368,31 @@ class HTTPXClient:
         data: Optional[Dict[str, Any]] = None,
         body: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, Any]] = None,
-        cookies: Optional[Dict[str, Any]] = None
+        cookies: Optional[Dict[str, Any]] = None,
     ) -> Optional[Dict[str, Any]]:
 
         try:
-            async with AsyncClient() as client:
-                response = await client.patch(
-                    url_service,
-                    params=params,
-                    json=body,
-                    data=data,
-                    headers=headers,
-                    cookies=cookies,
-                    timeout=timeout,
-                    auth=auth,
-                )
+            response = await self._send(
+                "PATCH",
+                url_service,
+                params=params,
+                json=body,
+                data=data,
+                headers=headers,
+                cookies=cookies,
+                timeout=timeout,
+                auth=auth,
+            )
 
-                json_response = (
-                    response.json() if response.status_code == status_response else None
-                )
-                return json_response
+            json_response = (
+                response.json() if response.status_code == status_response else None
+            )
+            return json_response
+        except (BackendUnavailableError, deadline.DeadlineExceededError):
+            raise
         except Exception as e:
             log.error(e)
             return None
+
+
+httpx_client = HTTPXClient()
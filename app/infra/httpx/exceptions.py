@@ -0,0 +1,5 @@
+class BackendUnavailableError(Exception):
+    """
+    The backend could not be reached, kept answering with a server error, or its
+    circuit breaker is open.
+    """
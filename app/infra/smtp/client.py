@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import queue
+import smtplib
+from concurrent.futures import ThreadPoolExecutor
+from email.message import Message
+from typing import Dict, Optional
+
+from app.core.config import Settings, get_settings
+from app.infra.smtp.exceptions import PermanentDeliveryError
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
+
+
+class SMTPClient:
+    """
+    Pool of authenticated SMTP connections. The blocking smtplib calls run on a
+    thread pool of the same size, so sending never blocks the event loop.
+    Refused recipients and 5xx replies raise PermanentDeliveryError.
+    """
+
+    def __init__(
+        self,
+        *,
+        host: str,
+        port: int,
+        user: str,
+        password: str,
+        pool_size: int,
+        timeout: float,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.sent = 0
+        self.reconnects = 0
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue(maxsize=pool_size)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="smtp-client"
+            )
+        return self._executor
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+
+    def _discard(self, server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _checkout(self) -> smtplib.SMTP:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+
+    def _checkin(self, server: smtplib.SMTP) -> None:
+        try:
+            self._idle.put_nowait(server)
+        except queue.Full:
+            self._discard(server)
+
+    def _send(self, msg: Message) -> None:
+        server = self._checkout()
+        try:
+            try:
+                server.send_message(msg)
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Pooled connections are dropped by the server once idle for too
+                # long, so reconnect once before giving up.
+                server.close()
+                self.reconnects += 1
+                server = self._connect()
+                server.send_message(msg)
+        except Exception:
+            self._discard(server)
+            raise
+        self._checkin(server)
+        self.sent += 1
+
+    async def send(self, msg: Message) -> None:
+        loop = asyncio.get_event_loop()
+        try:
+            await loop.run_in_executor(self._get_executor(), self._send, msg)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise PermanentDeliveryError(f"Recipients refused: {e.recipients}") from e
+        except smtplib.SMTPResponseException as e:
+            if e.smtp_code >= 500:
+                raise PermanentDeliveryError(
+                    f"SMTP {e.smtp_code}: {e.smtp_error!r}"
+                ) from e
+            raise
+
+    def _close(self) -> None:
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(self._executor, self._close)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pool_size": self.pool_size,
+            "idle": self._idle.qsize(),
+            "sent": self.sent,
+            "reconnects": self.reconnects,
+        }
+
+
+smtp_client = SMTPClient(
+    host=settings.SMTP_HOST,
+    port=int(settings.SMTP_PORT),
+    user=settings.SMTP_USER,
+    password=settings.SMTP_PASSWORD,
+    pool_size=settings.SMTP_POOL_SIZE,
+    timeout=settings.SMTP_TIMEOUT,
+)
@@ -0,0 +1,5 @@
+class PermanentDeliveryError(Exception):
+    """
+    The SMTP server refused the message for good, with a 5xx reply or by refusing
+    its recipients; sending it again won't help.
+    """
@@ -1,19 +1,96 @@
 import logging
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
 
 from app.api.api_v1.api import api_router
+from app.core.config import Settings, get_settings
+from app.core.deadline import DeadlineExceededError, DeadlineMiddleware
+from app.core.degraded import DEGRADED_HEADER, DegradedModeMiddleware
+from app.core.identity_map import IdentityMapMiddleware
+from app.core.security import password_hasher
+from app.core.shared_cache import SharedCacheError, shared_cache
+from app.infra.httpx.client import HTTPXClient
+from app.infra.httpx.exceptions import BackendUnavailableError
+from app.infra.smtp.client import smtp_client
+from app.services.notification import notification_outbox
+from app.utils.email_templates import load_templates
+from app.utils.pagination import NEXT_CURSOR_HEADER
 
 from .debugger import initialize_fastapi_server_debugger_if_needed
 
 log = logging.getLogger("uvicorn.info")
 
+settings: Settings = get_settings()
+
+
+async def startup_event():
+    log.info("Starting up...")
+    await HTTPXClient.start()
+    notification_outbox.start()
+    load_templates()
+    shared_cache.start()
+
+
+async def shutdown_event():
+    log.info("Shutting down...")
+    await notification_outbox.stop(timeout=settings.NOTIFICATION_DRAIN_TIMEOUT_SECONDS)
+    await HTTPXClient.close()
+    password_hasher.shutdown()
+    await smtp_client.close()
+    await shared_cache.stop()
+
+
+async def backend_unavailable_handler(
+    request: Request, exc: BackendUnavailableError
+) -> JSONResponse:
+    log.error(exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The backend service is unavailable, try again later."},
+        headers={"Retry-After": str(int(settings.BACKEND_BREAKER_RECOVERY_SECONDS))},
+    )
+
+
+async def deadline_exceeded_handler(
+    request: Request, exc: DeadlineExceededError
+) -> JSONResponse:
+    log.error(exc)
+    return JSONResponse(
+        status_code=504,
+        content={"detail": "The request took too long, try again later."},
+    )
+
+
+async def shared_cache_error_handler(
+    request: Request, exc: SharedCacheError
+) -> JSONResponse:
+    log.error(exc)
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The service is temporarily unavailable, try again later."},
+    )
+
 
 def create_application() -> FastAPI:
     initialize_fastapi_server_debugger_if_needed()
     application = FastAPI()
     application.include_router(api_router, prefix="/api/v1")
+    application.add_exception_handler(
+        BackendUnavailableError, backend_unavailable_handler
+    )
+    application.add_exception_handler(DeadlineExceededError, deadline_exceeded_handler)
+    application.add_exception_handler(SharedCacheError, shared_cache_error_handler)
+    application.add_middleware(DeadlineMiddleware)
+    application.add_middleware(IdentityMapMiddleware)
+    application.add_middleware(
+        DegradedModeMiddleware,
+        is_unavailable=lambda: HTTPXClient.get_breaker(settings.DATABASE_URL).is_open(),
+        retry_after=int(settings.BACKEND_BREAKER_RECOVERY_SECONDS),
+    )
+    application.add_event_handler("startup", startup_event)
+    application.add_event_handler("shutdown", shutdown_event)
     return application
 
 
@@ -26,14 +103,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, DEGRADED_HEADER],
 )
-
-
-@app.on_event("startup")
-async def startup_event():
-    log.info("Starting up...")
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    log.info("Shutting down...")
@@ -0,0 +1,11 @@
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel
+
+
+class BatchItemResult(BaseModel):
+    index: int
+    id: str
+    status: int
+    detail: Optional[str]
+    item: Optional[Dict[str, Any]]
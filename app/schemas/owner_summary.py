@@ -0,0 +1,8 @@
+from typing import List
+
+from app.schemas.reparation_detail import ReparationDetail
+from app.schemas.vehicle import Vehicle
+
+
+class OwnerVehicleSummary(Vehicle):
+    reparation_details: List[ReparationDetail] = []
@@ -32,6 +32,7 @@ class EmployeeQueryParams(UserQueryParams):
         role: Optional[str] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> None:
         super().__init__(
             identity_card=identity_card,
@@ -45,6 +46,7 @@ class EmployeeQueryParams(UserQueryParams):
         self.role = role
         self.skip = skip
         self.limit = limit
+        self.cursor = cursor
 
 
 class OwnerQueryParams(UserQueryParams):
@@ -59,6 +61,7 @@ class OwnerQueryParams(UserQueryParams):
         update_employee: Optional[bool] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> None:
         super().__init__(
             identity_card=identity_card,
@@ -71,6 +74,7 @@ class OwnerQueryParams(UserQueryParams):
         self.update_employee = update_employee
         self.skip = skip
         self.limit = limit
+        self.cursor = cursor
 
 
 class ReparationDetailQueryParams:
@@ -100,6 +104,7 @@ class VehicleQueryParams:
         state: Optional[str] = None,
         skip: Optional[int] = None,
         limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> None:
         self.plate = plate
         self.brand = brand
@@ -109,6 +114,7 @@ class VehicleQueryParams:
         self.state = state
         self.skip = skip
         self.limit = limit
+        self.cursor = cursor
 
 
 class VehicleXOwnerQueryParams:
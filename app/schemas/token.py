@@ -1,7 +1,10 @@
 from datetime import datetime
+from typing import Optional
 
 from pydantic import BaseModel
 
+from app.schemas.employee import Role
+
 
 class Token(BaseModel):
     access_token: str
@@ -10,6 +13,9 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: str
+    role: Optional[Role]
+    is_active: Optional[bool]
+    ver: Optional[int]
 
 
 class OwnerTokenPayload(TokenPayload):
@@ -0,0 +1,14 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from app.schemas.owner import Owner
+from app.schemas.reparation_detail import ReparationDetail
+from app.schemas.vehicle import Vehicle
+
+
+class VehicleDossier(BaseModel):
+    vehicle: Optional[Vehicle]
+    owners: Optional[List[Owner]]
+    reparation_details: Optional[List[ReparationDetail]]
+    missing: List[str] = []
@@ -1,12 +1,11 @@
 from typing import Optional
 
 from app.core.config import Settings, get_settings
-from app.core.security import verify_password
-from app.infra.httpx.client import HTTPXClient
+from app.core.security import async_verify_password
+from app.infra.httpx.client import httpx_client
 from app.schemas.employee import Employee
 from app.schemas.owner import Owner
-
-httpx_client = HTTPXClient()
+from app.services.owner import owner_service
 
 settings: Settings = get_settings()
 
@@ -24,17 +23,13 @@ class AuthService:
 
         if not user:
             return None
-        if not verify_password(password, user["password"]):
+        if not await async_verify_password(password, user["password"]):
             return None
         user = Employee(**user)
         return user
 
     async def owner_authenticate(self, *, identity_card: str) -> Optional[Owner]:
-        url = f"{settings.DATABASE_URL}/api/owners/{identity_card}"
-        header = {"Content-Type": "application/json"}
-        user = await httpx_client.get(
-            url_service=url, status_response=200, headers=header, timeout=40
-        )
+        user = await owner_service.get_by_id(owner_id=identity_card)
 
         if not user:
             return None
@@ -0,0 +1,18 @@
+import asyncio
+from typing import Any, Awaitable, List
+
+
+async def gather_or_cancel(*aws: Awaitable[Any]) -> List[Any]:
+    """
+    Runs independent lookups together and returns their results in order. As
+    soon as one of them raises, the others are cancelled and the error is
+    re-raised, instead of leaving them running as asyncio.gather does.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
@@ -1,21 +1,38 @@
 from typing import List
 
+from app.core.cache import ReadThroughCache
 from app.core.config import Settings, get_settings
-from app.core.security import get_password_hash
-from app.infra.httpx.client import HTTPXClient
+from app.core.security import async_get_password_hash
+from app.core.shared_cache import shared_cache
+from app.infra.httpx.client import httpx_client
+from app.infra.httpx.exceptions import BackendUnavailableError
 from app.schemas.employee import CreateEmployee, Employee, EmployeeInDB, UpdateEmployee
 from app.schemas.search import EmployeeQueryParams
-
-httpx_client = HTTPXClient()
+from app.utils.pagination import backend_params
 
 settings: Settings = get_settings()
 
 
 class EmployeeService:
     def __init__(self):
-        return
+        self.cache = ReadThroughCache(
+            name="employee",
+            maxsize=settings.ENTITY_CACHE_MAXSIZE,
+            ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.ENTITY_CACHE_STALE_SECONDS,
+            early_expiry_beta=settings.ENTITY_CACHE_EARLY_EXPIRY_BETA,
+            fallback_on=(BackendUnavailableError,),
+            last_good_ttl=settings.DEGRADED_MAX_STALENESS_SECONDS,
+            shared=shared_cache,
+            negative_ttl=settings.ENTITY_NEGATIVE_CACHE_TTL_SECONDS,
+        )
 
     async def get_by_id(self, *, employee_id: str) -> Employee:
+        return await self.cache.get_or_load(
+            employee_id, lambda: self._get_by_id(employee_id=employee_id)
+        )
+
+    async def _get_by_id(self, *, employee_id: str) -> Employee:
         url = f"{settings.DATABASE_URL}/api/employees/{employee_id}"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.get(
@@ -32,13 +49,15 @@ class EmployeeService:
         return response
 
     async def create(self, *, employee_in: CreateEmployee) -> CreateEmployee:
-        employee_in.password = get_password_hash(employee_in.password)
+        employee_in.password = await async_get_password_hash(employee_in.password)
         url = f"{settings.DATABASE_URL}/api/employees"
         header = {"Content-Type": "application/json"}
         user = employee_in.dict()
         response = await httpx_client.post(
             url_service=url, status_response=201, body=user, headers=header, timeout=40
         )
+        if response:
+            await self.cache.invalidate(employee_in.identity_card)
         return response
 
     async def update(
@@ -50,15 +69,13 @@ class EmployeeService:
         response = await httpx_client.patch(
             url_service=url, status_response=200, body=user, headers=header, timeout=40
         )
+        await self.cache.invalidate(employee_id)
         return response
 
     async def get_all(self, *, query_args: EmployeeQueryParams) -> List[Employee]:
         url = f"{settings.DATABASE_URL}/api/employees"
         header = {"Content-Type": "application/json"}
-        payload = query_args.__dict__
-        params = {
-            key: value for (key, value) in payload.items() if value not in [None, ""]
-        }
+        params = backend_params(query_args.__dict__)
         response = await httpx_client.get(
             url_service=url,
             status_response=200,
@@ -0,0 +1,204 @@
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from app.core import deadline, identity_map
+from app.core.config import Settings, get_settings
+from app.infra.smtp.exceptions import PermanentDeliveryError
+from app.services.vehicle import vehicle_service
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
+
+
+class Notification:
+    def __init__(self, *, send: Callable[..., Awaitable[Any]], kwargs: Dict[str, Any]):
+        self.send = send
+        self.kwargs = kwargs
+        self.attempts = 0
+        self.enqueued_at = time.monotonic()
+
+    def __repr__(self) -> str:
+        return f"Notification({self.send.__name__}, {self.kwargs})"
+
+
+class NotificationOutbox:
+    """
+    In-process outbox for email notifications. Handlers enqueue and return at
+    once; a pool of workers drains the queue in batches. Failed sends go back on
+    the queue after an exponential backoff, so they don't hold up the rest;
+    exhausted ones and those refused for good move to ``dead_letters``.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int,
+        batch_size: int,
+        max_retries: int,
+        retry_backoff: float,
+        dead_letter_size: int,
+    ):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.dead_letters: Deque[Notification] = deque(maxlen=dead_letter_size)
+        self.enqueued = 0
+        self.delivered = 0
+        self.retried = 0
+        self.failed = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.fanout_recipients = 0
+        self.fanout_failures = 0
+        self._queue: Optional["asyncio.Queue[Notification]"] = None
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self, *, timeout: float) -> None:
+        if self._queue is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            log.error(f"Notification outbox stopped with {self._queue.qsize()} pending")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    def enqueue(self, send: Callable[..., Awaitable[Any]], **kwargs: Any) -> None:
+        self.start()
+        self._queue.put_nowait(Notification(send=send, kwargs=kwargs))
+        self.enqueued += 1
+
+    def enqueue_many(
+        self, send: Callable[..., Awaitable[Any]], kwargs_list: List[Dict[str, Any]]
+    ) -> None:
+        for kwargs in kwargs_list:
+            self.enqueue(send, **kwargs)
+
+    async def _work(self) -> None:
+        # Workers may be started lazily from a request; don't inherit its budget
+        # nor its identity map.
+        deadline.set_deadline(None)
+        identity_map.set_scope(None)
+        queue = self._queue
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < self.batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            await asyncio.gather(*[self._deliver(item, queue) for item in batch])
+
+    async def _deliver(
+        self, notification: Notification, queue: "asyncio.Queue[Notification]"
+    ) -> None:
+        notification.attempts += 1
+        try:
+            delivered = await notification.send(**notification.kwargs)
+        except PermanentDeliveryError as e:
+            log.error(e)
+            self._dead_letter(notification, queue)
+            return
+        except Exception as e:
+            log.error(e)
+            delivered = False
+        if delivered is not False:
+            latency = time.monotonic() - notification.enqueued_at
+            self.delivered += 1
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            queue.task_done()
+            return
+        if notification.attempts > self.max_retries:
+            self._dead_letter(notification, queue)
+            return
+        self.retried += 1
+        backoff = self.retry_backoff * 2 ** (notification.attempts - 1)
+        asyncio.get_event_loop().call_later(
+            backoff * random.uniform(0.5, 1.5), self._requeue, notification, queue
+        )
+
+    def _dead_letter(
+        self, notification: Notification, queue: "asyncio.Queue[Notification]"
+    ) -> None:
+        self.failed += 1
+        self.dead_letters.append(notification)
+        queue.task_done()
+
+    def _requeue(
+        self, notification: Notification, queue: "asyncio.Queue[Notification]"
+    ) -> None:
+        # The item stays unfinished while it waits, so stop() drains it too.
+        queue.put_nowait(notification)
+        queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "retried": self.retried,
+            "failed": self.failed,
+            "dead_letters": len(self.dead_letters),
+            "latency_avg": (
+                self.latency_total / self.delivered if self.delivered else 0.0
+            ),
+            "latency_max": self.latency_max,
+            "fanout_recipients": self.fanout_recipients,
+            "fanout_failures": self.fanout_failures,
+        }
+
+
+notification_outbox = NotificationOutbox(
+    workers=settings.NOTIFICATION_WORKERS,
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    max_retries=settings.NOTIFICATION_MAX_RETRIES,
+    retry_backoff=settings.NOTIFICATION_RETRY_BACKOFF_SECONDS,
+    dead_letter_size=settings.NOTIFICATION_DEAD_LETTER_SIZE,
+)
+
+
+async def _send_to_recipient(
+    *, send_bulk: Callable[..., Awaitable[Dict[str, bool]]], email_to: str, **kwargs
+) -> bool:
+    results = await send_bulk(emails_to=[email_to], **kwargs)
+    return all(results.values())
+
+
+async def notify_vehicle_owners(
+    *,
+    vehicle_id: str,
+    send_bulk: Callable[..., Awaitable[Dict[str, bool]]],
+    **kwargs: Any,
+) -> Dict[str, bool]:
+    """
+    Sends one rendered notification to every distinct owner of the vehicle.
+    Recipients that fail are re-enqueued individually so the outbox retries them.
+    An unreachable backend raises, so the outbox retries the whole job; a vehicle
+    without owners (None) has nobody to notify.
+    """
+    owners = await vehicle_service.get_vehicle_owners(vehicle_id=vehicle_id)
+    if not owners:
+        return {}
+    results = await send_bulk(emails_to=[owner["email"] for owner in owners], **kwargs)
+    notification_outbox.fanout_recipients += len(results)
+    for email_to, delivered in results.items():
+        if not delivered:
+            notification_outbox.fanout_failures += 1
+            log.error(f"Notification for vehicle {vehicle_id} to {email_to} failed")
+            notification_outbox.enqueue(
+                _send_to_recipient, send_bulk=send_bulk, email_to=email_to, **kwargs
+            )
+    return results
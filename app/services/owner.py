@@ -1,21 +1,52 @@
-from typing import List
+import asyncio
+from typing import Any, Dict, List
 
+from app.core.batch_loader import BatchLoader
+from app.core.cache import ReadThroughCache
 from app.core.config import Settings, get_settings
-from app.infra.httpx.client import HTTPXClient
+from app.core.shared_cache import shared_cache
+from app.infra.httpx.client import httpx_client
+from app.infra.httpx.exceptions import BackendUnavailableError
 from app.schemas.owner import CreateOwner, Owner, OwnerInDB, UpdateOwner
+from app.schemas.owner_summary import OwnerVehicleSummary
 from app.schemas.search import OwnerQueryParams
 from app.schemas.vehicle import Vehicle
-
-httpx_client = HTTPXClient()
+from app.services.owner_summary import owner_summary_cache
+from app.services.reparation_details import reparation_detail_service
+from app.utils.pagination import backend_params
 
 settings: Settings = get_settings()
 
 
 class OwnerService:
     def __init__(self):
-        return
+        self.cache = ReadThroughCache(
+            name="owner",
+            maxsize=settings.ENTITY_CACHE_MAXSIZE,
+            ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.ENTITY_CACHE_STALE_SECONDS,
+            early_expiry_beta=settings.ENTITY_CACHE_EARLY_EXPIRY_BETA,
+            fallback_on=(BackendUnavailableError,),
+            last_good_ttl=settings.DEGRADED_MAX_STALENESS_SECONDS,
+            shared=shared_cache,
+            negative_ttl=settings.ENTITY_NEGATIVE_CACHE_TTL_SECONDS,
+        )
+        self.loader = BatchLoader(
+            name="owner",
+            load_one=lambda owner_id: self._get_by_id(owner_id=owner_id),
+            load_many=(
+                self._get_many if settings.BACKEND_SUPPORTS_BULK_LOOKUP else None
+            ),
+            window=settings.BATCH_LOADER_WINDOW_SECONDS,
+            max_batch=settings.BATCH_LOADER_MAX_BATCH,
+        )
 
     async def get_by_id(self, *, owner_id: str) -> Owner:
+        return await self.cache.get_or_load(
+            owner_id, lambda: self.loader.load(owner_id)
+        )
+
+    async def _get_by_id(self, *, owner_id: str) -> Owner:
         url = f"{settings.DATABASE_URL}/api/owners/{owner_id}"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.get(
@@ -23,6 +54,12 @@ class OwnerService:
         )
         return response
 
+    async def _get_many(self, owner_ids: List[str]) -> Dict[str, Owner]:
+        owners = await self.get_page(
+            params={"identity_card": ",".join(owner_ids), "limit": len(owner_ids)}
+        )
+        return {owner["identity_card"]: owner for owner in owners or []}
+
     async def get_owner_vehicles(self, *, owner_id: str) -> List[Vehicle]:
         url = f"{settings.DATABASE_URL}/api/vehicles-x-owners/owner/{owner_id}/vehicles"
         header = {"Content-Type": "application/json"}
@@ -31,6 +68,29 @@ class OwnerService:
         )
         return response
 
+    async def get_summary(self, *, owner_id: str) -> List[OwnerVehicleSummary]:
+        """
+        Owner's vehicles with their reparation details, fetched with at most
+        OWNER_SUMMARY_CONCURRENCY backend calls at a time and cached briefly.
+        """
+        summary = owner_summary_cache.get(owner_id)
+        if summary is not None:
+            return summary
+        generation = owner_summary_cache.generation
+        vehicles = await self.get_owner_vehicles(owner_id=owner_id) or []
+        semaphore = asyncio.Semaphore(settings.OWNER_SUMMARY_CONCURRENCY)
+
+        async def with_details(vehicle: Vehicle) -> OwnerVehicleSummary:
+            async with semaphore:
+                details = await reparation_detail_service.get_by_owner(
+                    vehicle_id=vehicle["plate"], owner_id=owner_id
+                )
+            return {**vehicle, "reparation_details": details or []}
+
+        summary = await asyncio.gather(*[with_details(v) for v in vehicles])
+        owner_summary_cache.set(owner_id, summary, generation=generation)
+        return summary
+
     async def create(self, *, owner_in: CreateOwner) -> CreateOwner:
         url = f"{settings.DATABASE_URL}/api/owners"
         header = {"Content-Type": "application/json"}
@@ -42,6 +102,8 @@ class OwnerService:
             headers=header,
             timeout=40,
         )
+        if response:
+            await self.cache.invalidate(owner_in.identity_card)
         return response
 
     async def get_all(
@@ -49,12 +111,11 @@ class OwnerService:
         *,
         query_args: OwnerQueryParams,
     ) -> List[Owner]:
+        return await self.get_page(params=backend_params(query_args.__dict__))
+
+    async def get_page(self, *, params: Dict[str, Any]) -> List[Owner]:
         url = f"{settings.DATABASE_URL}/api/owners"
         header = {"Content-Type": "application/json"}
-        payload = query_args.__dict__
-        params = {
-            key: value for (key, value) in payload.items() if value not in [None, ""]
-        }
         response = await httpx_client.get(
             url_service=url,
             status_response=200,
@@ -71,6 +132,7 @@ class OwnerService:
         response = await httpx_client.patch(
             url_service=url, status_response=200, body=user, headers=header, timeout=40
         )
+        await self.cache.invalidate(owner_id)
         return response
 
     async def delete(self, *, owner_id: str, vehicle_id: str) -> int:
@@ -79,6 +141,7 @@ class OwnerService:
         response = await httpx_client.delete(
             url_service=url, status_response=204, headers=header, timeout=40
         )
+        await owner_summary_cache.invalidate_owner(owner_id)
         return response
 
 
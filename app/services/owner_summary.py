@@ -0,0 +1,77 @@
+from typing import Any, Dict, List, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import Settings, get_settings
+from app.core.shared_cache import SharedCache, shared_cache
+from app.schemas.owner_summary import OwnerVehicleSummary
+
+settings: Settings = get_settings()
+
+
+class OwnerSummaryCache:
+    """
+    Owners' portal summaries, cached briefly per owner. Writes to an owner's
+    vehicle links, to a vehicle or to its reparation details drop every cached
+    summary that lists that vehicle, here and, through the shared cache, in the
+    other workers. A summary fetched across an invalidation is not stored.
+    """
+
+    OWNER_NAMESPACE = "owner_summary"
+    VEHICLE_NAMESPACE = "owner_summary_vehicle"
+
+    def __init__(self, *, maxsize: int, ttl: float, shared: SharedCache):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generation = 0
+        self.shared = shared
+        shared.subscribe(self.OWNER_NAMESPACE, self._drop_owner)
+        shared.subscribe(self.VEHICLE_NAMESPACE, self._drop_vehicle)
+
+    def get(self, owner_id: str) -> Optional[List[OwnerVehicleSummary]]:
+        return self._cache.get(owner_id)
+
+    def set(
+        self, owner_id: str, summary: List[OwnerVehicleSummary], *, generation: int
+    ) -> None:
+        """Stores the summary unless anything was invalidated since ``generation``."""
+        if generation == self.generation:
+            self._cache.set(owner_id, summary)
+
+    async def invalidate_owner(self, owner_id: str) -> None:
+        self._drop_owner(owner_id)
+        await self.shared.notify(self.OWNER_NAMESPACE, owner_id)
+
+    async def invalidate_vehicle(self, vehicle_id: Optional[str]) -> None:
+        """Drops the summaries listing the vehicle; all of them when it is None."""
+        self._drop_vehicle(vehicle_id)
+        await self.shared.notify(self.VEHICLE_NAMESPACE, vehicle_id)
+
+    def _drop_owner(self, owner_id: Optional[str]) -> None:
+        self.generation += 1
+        if owner_id is None:
+            self._cache.clear()
+        else:
+            self._cache.invalidate(owner_id)
+
+    def _drop_vehicle(self, vehicle_id: Optional[str]) -> None:
+        self.generation += 1
+        if vehicle_id is None:
+            self._cache.clear()
+            return
+        for owner_id in self._cache.keys():
+            summary = self._cache.peek(owner_id) or []
+            if any(vehicle["plate"] == vehicle_id for vehicle in summary):
+                self._cache.invalidate(owner_id)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+
+owner_summary_cache = OwnerSummaryCache(
+    maxsize=settings.OWNER_SUMMARY_CACHE_MAXSIZE,
+    ttl=settings.OWNER_SUMMARY_TTL_SECONDS,
+    shared=shared_cache,
+)
@@ -1,12 +1,10 @@
 from typing import List
 
 from app.core.config import Settings, get_settings
-from app.infra.httpx.client import HTTPXClient
+from app.infra.httpx.client import httpx_client
 from app.schemas.owner_token import CreateOwnerToken, OwnerToken
 from app.schemas.search import OwnerTokenQueryParams
 
-httpx_client = HTTPXClient()
-
 settings: Settings = get_settings()
 
 
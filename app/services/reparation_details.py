@@ -1,20 +1,43 @@
+from typing import Any, Dict, List
+
+from app.core.cache import ReadThroughCache
 from app.core.config import Settings, get_settings
-from app.infra.httpx.client import HTTPXClient
+from app.core.shared_cache import shared_cache
+from app.infra.httpx.client import httpx_client
+from app.infra.httpx.exceptions import BackendUnavailableError
 from app.schemas.reparation_detail import (
     BaseReparationDetail,
     CreateReparationDetail,
     ReparationDetail,
     UpdateReparationDetail,
 )
-
-httpx_client = HTTPXClient()
+from app.services.owner_summary import owner_summary_cache
 
 settings: Settings = get_settings()
 
 
 class ReparationDetailService:
     def __init__(self):
-        return
+        self.cache = ReadThroughCache(
+            name="reparation_detail",
+            maxsize=settings.ENTITY_CACHE_MAXSIZE,
+            ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.ENTITY_CACHE_STALE_SECONDS,
+            early_expiry_beta=settings.ENTITY_CACHE_EARLY_EXPIRY_BETA,
+            fallback_on=(BackendUnavailableError,),
+            last_good_ttl=settings.DEGRADED_MAX_STALENESS_SECONDS,
+            shared=shared_cache,
+        )
+        self.vehicle_cache = ReadThroughCache(
+            name="reparation_details_by_vehicle",
+            maxsize=settings.ENTITY_CACHE_MAXSIZE,
+            ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.ENTITY_CACHE_STALE_SECONDS,
+            early_expiry_beta=settings.ENTITY_CACHE_EARLY_EXPIRY_BETA,
+            fallback_on=(BackendUnavailableError,),
+            last_good_ttl=settings.DEGRADED_MAX_STALENESS_SECONDS,
+            shared=shared_cache,
+        )
 
     async def create_detail(
         self, *, employee_id: str, vehicle_id: str, detail: BaseReparationDetail
@@ -31,6 +54,8 @@ class ReparationDetailService:
             headers=header,
             timeout=40,
         )
+        await self.vehicle_cache.invalidate(vehicle_id)
+        await owner_summary_cache.invalidate_vehicle(vehicle_id)
         return response
 
     async def update_detail(
@@ -50,9 +75,18 @@ class ReparationDetailService:
             headers=header,
             timeout=40,
         )
+        await self.cache.invalidate(reparation_id)
+        if response:
+            await self.vehicle_cache.invalidate(response["vehicle_id"])
+            await owner_summary_cache.invalidate_vehicle(response["vehicle_id"])
         return response
 
     async def get_by_vehicle(self, *, vehicle_id: str) -> ReparationDetail:
+        return await self.vehicle_cache.get_or_load(
+            vehicle_id, lambda: self._get_by_vehicle(vehicle_id=vehicle_id)
+        )
+
+    async def _get_by_vehicle(self, *, vehicle_id: str) -> ReparationDetail:
         url = f"{settings.DATABASE_URL}/api/details"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.get(
@@ -64,6 +98,18 @@ class ReparationDetailService:
         )
         return response
 
+    async def get_page(self, *, params: Dict[str, Any]) -> List[ReparationDetail]:
+        url = f"{settings.DATABASE_URL}/api/details"
+        header = {"Content-Type": "application/json"}
+        response = await httpx_client.get(
+            url_service=url,
+            status_response=200,
+            headers=header,
+            params=params,
+            timeout=40,
+        )
+        return response
+
     async def get_by_owner(self, *, vehicle_id: str, owner_id: str) -> ReparationDetail:
         url = f"{settings.DATABASE_URL}/api/details"
         header = {"Content-Type": "application/json"}
@@ -77,6 +123,11 @@ class ReparationDetailService:
         return response
 
     async def get_by_id(self, *, reparation_id: int) -> ReparationDetail:
+        return await self.cache.get_or_load(
+            reparation_id, lambda: self._get_by_id(reparation_id=reparation_id)
+        )
+
+    async def _get_by_id(self, *, reparation_id: int) -> ReparationDetail:
         url = f"{settings.DATABASE_URL}/api/details/{reparation_id}"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.get(
@@ -84,12 +135,15 @@ class ReparationDetailService:
         )
         return response
 
-    async def delete_by_id(self, *, reparation_id: int) -> int:
+    async def delete_by_id(self, *, reparation_id: int, vehicle_id: str) -> int:
         url = f"{settings.DATABASE_URL}/api/details/{reparation_id}"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.delete(
             url_service=url, status_response=204, headers=header, timeout=40
         )
+        await self.cache.invalidate(reparation_id)
+        await self.vehicle_cache.invalidate(vehicle_id)
+        await owner_summary_cache.invalidate_vehicle(vehicle_id)
         return response
 
 
@@ -1,22 +1,50 @@
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
+from app.core.batch_loader import BatchLoader
+from app.core.cache import ReadThroughCache
 from app.core.config import Settings, get_settings
-from app.infra.httpx.client import HTTPXClient
+from app.core.shared_cache import shared_cache
+from app.infra.httpx.client import httpx_client
+from app.infra.httpx.exceptions import BackendUnavailableError
 from app.schemas.owner import Owner
 from app.schemas.search import VehicleQueryParams
 from app.schemas.vehicle import CreateVehicle, UpdateVehicle, Vehicle, VehicleInDB
 from app.schemas.vehicle_x_owner import VehicleXOwner
-
-httpx_client = HTTPXClient()
+from app.services.owner_summary import owner_summary_cache
+from app.utils.pagination import backend_params
 
 settings: Settings = get_settings()
 
 
 class VehicleService:
     def __init__(self):
-        return
+        self.cache = ReadThroughCache(
+            name="vehicle",
+            maxsize=settings.ENTITY_CACHE_MAXSIZE,
+            ttl=settings.ENTITY_CACHE_TTL_SECONDS,
+            stale_ttl=settings.ENTITY_CACHE_STALE_SECONDS,
+            early_expiry_beta=settings.ENTITY_CACHE_EARLY_EXPIRY_BETA,
+            fallback_on=(BackendUnavailableError,),
+            last_good_ttl=settings.DEGRADED_MAX_STALENESS_SECONDS,
+            shared=shared_cache,
+            negative_ttl=settings.ENTITY_NEGATIVE_CACHE_TTL_SECONDS,
+        )
+        self.loader = BatchLoader(
+            name="vehicle",
+            load_one=lambda vehicle_id: self._get_by_plate(vehicle_id=vehicle_id),
+            load_many=(
+                self._get_many if settings.BACKEND_SUPPORTS_BULK_LOOKUP else None
+            ),
+            window=settings.BATCH_LOADER_WINDOW_SECONDS,
+            max_batch=settings.BATCH_LOADER_MAX_BATCH,
+        )
 
     async def get_by_plate(self, *, vehicle_id: str) -> Vehicle:
+        return await self.cache.get_or_load(
+            vehicle_id, lambda: self.loader.load(vehicle_id)
+        )
+
+    async def _get_by_plate(self, *, vehicle_id: str) -> Vehicle:
         url = f"{settings.DATABASE_URL}/api/vehicles/{vehicle_id}"
         header = {"Content-Type": "application/json"}
         response = await httpx_client.get(
@@ -24,6 +52,12 @@ class VehicleService:
         )
         return response
 
+    async def _get_many(self, vehicle_ids: List[str]) -> Dict[str, Vehicle]:
+        vehicles = await self.get_page(
+            params={"plate": ",".join(vehicle_ids), "limit": len(vehicle_ids)}
+        )
+        return {vehicle["plate"]: vehicle for vehicle in vehicles or []}
+
     async def create(self, *, vehicle_in: CreateVehicle) -> CreateVehicle:
         url = f"{settings.DATABASE_URL}/api/vehicles"
         header = {"Content-Type": "application/json"}
@@ -35,6 +69,8 @@ class VehicleService:
             headers=header,
             timeout=40,
         )
+        if response:
+            await self.cache.invalidate(vehicle_in.plate)
         return response
 
     async def create_owner_vehicle(
@@ -50,6 +86,8 @@ class VehicleService:
             headers=header,
             timeout=40,
         )
+        if response:
+            await owner_summary_cache.invalidate_owner(owner_id)
         return response
 
     async def get_all(
@@ -57,12 +95,11 @@ class VehicleService:
         *,
         query_args: VehicleQueryParams,
     ) -> Optional[List[Vehicle]]:
+        return await self.get_page(params=backend_params(query_args.__dict__))
+
+    async def get_page(self, *, params: Dict[str, Any]) -> Optional[List[Vehicle]]:
         url = f"{settings.DATABASE_URL}/api/vehicles"
         header = {"Content-Type": "application/json"}
-        payload = query_args.__dict__
-        params = {
-            key: value for (key, value) in payload.items() if value not in [None, ""]
-        }
         response = await httpx_client.get(
             url_service=url,
             status_response=200,
@@ -92,6 +129,8 @@ class VehicleService:
         response = await httpx_client.patch(
             url_service=url, status_response=200, body=user, headers=header, timeout=40
         )
+        await self.cache.invalidate(vehicle_id)
+        await owner_summary_cache.invalidate_vehicle(vehicle_id)
         return response
 
 
@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import Settings, get_settings
+from app.core.deadline import DeadlineExceededError
+from app.infra.httpx.exceptions import BackendUnavailableError
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
+
+
+def check_batch_size(items: List[Any]) -> None:
+    if len(items) > settings.BATCH_CREATE_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch can hold at most {settings.BATCH_CREATE_MAX_SIZE} items.",
+        )
+
+
+def _result(
+    index: int,
+    item_id: str,
+    status: int,
+    detail: Optional[str] = None,
+    item: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "id": item_id,
+        "status": status,
+        "detail": detail,
+        "item": item,
+    }
+
+
+async def create_batch(
+    ids: List[str],
+    *,
+    exists: Callable[[str], Awaitable[Any]],
+    create: Callable[[int], Awaitable[Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Creates every item whose id isn't already in the backend. Uniqueness
+    checks and creations run concurrently, at most BATCH_CREATE_CONCURRENCY at
+    a time; one result is returned per item, in order, with the status the
+    single-item endpoint would have answered. A batch repeating an id is
+    rejected as a whole before any backend call.
+    """
+    repeated = sorted(item_id for item_id, n in Counter(ids).items() if n > 1)
+    if repeated:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ids repeated in this batch: {', '.join(repeated)}.",
+        )
+    semaphore = asyncio.Semaphore(settings.BATCH_CREATE_CONCURRENCY)
+
+    async def create_one(index: int, item_id: str) -> Dict[str, Any]:
+        try:
+            async with semaphore:
+                if await exists(item_id):
+                    return _result(index, item_id, 400, "Already exists.")
+                created = await create(index)
+        except (BackendUnavailableError, DeadlineExceededError) as e:
+            log.error(f"Batch item {item_id} failed: {e!r}")
+            return _result(index, item_id, 503, "Backend unavailable.")
+        if not created:
+            return _result(index, item_id, 500, "Not created.")
+        return _result(index, item_id, 201, item=created)
+
+    return await asyncio.gather(
+        *[create_one(index, item_id) for index, item_id in enumerate(ids)]
+    )
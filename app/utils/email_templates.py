@@ -0,0 +1,68 @@
+import os
+from string import Formatter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import Settings, get_settings
+
+settings: Settings = get_settings()
+
+_formatter = Formatter()
+
+
+class EmailTemplate:
+    """
+    ``str.format`` template parsed once into literal and field segments. With
+    ``auto_reload`` the file is re-read whenever its modification time changes.
+    """
+
+    def __init__(self, path: str, *, auto_reload: bool = False):
+        self.path = path
+        self.auto_reload = auto_reload
+        self._mtime: Optional[float] = None
+        self._segments: List[Tuple[str, Optional[str], str, Optional[str]]] = []
+
+    def load(self) -> None:
+        mtime = os.stat(self.path).st_mtime
+        if self._mtime is not None and (not self.auto_reload or mtime == self._mtime):
+            return
+        with open(self.path) as f:
+            self._segments = list(_formatter.parse(f.read()))
+        self._mtime = mtime
+
+    def render(self, **kwargs: Any) -> str:
+        if self._mtime is None or self.auto_reload:
+            self.load()
+        rendered = []
+        for literal, field_name, format_spec, conversion in self._segments:
+            rendered.append(literal)
+            if field_name is None:
+                continue
+            value, _ = _formatter.get_field(field_name, (), kwargs)
+            value = _formatter.convert_field(value, conversion)
+            rendered.append(format(value, format_spec))
+        return "".join(rendered)
+
+
+_templates: Dict[str, EmailTemplate] = {}
+
+
+def get_template(template_name: str) -> EmailTemplate:
+    template = _templates.get(template_name)
+    if template is None:
+        template = EmailTemplate(
+            os.path.join(settings.EMAIL_TEMPLATES_DIR, template_name),
+            auto_reload=settings.EMAIL_TEMPLATES_AUTO_RELOAD,
+        )
+        template.load()
+        _templates[template_name] = template
+    return template
+
+
+def load_templates() -> None:
+    for name in sorted(os.listdir(settings.EMAIL_TEMPLATES_DIR)):
+        if name.endswith(".html"):
+            get_template(name)
+
+
+def render_template(template_name: str, **kwargs: Any) -> str:
+    return get_template(template_name).render(**kwargs)
@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+import logging
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from starlette.responses import StreamingResponse
+
+from app.core.config import Settings, get_settings
+
+log = logging.getLogger(__name__)
+
+settings: Settings = get_settings()
+
+# Offset params only apply to the first page; later ones continue by keyset.
+OFFSET_PARAMS = ("skip",)
+
+
+class ExportAbortedError(Exception):
+    """The backend failed in the middle of an export."""
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv",
+}
+
+
+async def iter_pages(
+    get_page: Callable[..., Awaitable[Optional[List[Dict[str, Any]]]]],
+    *,
+    params: Dict[str, Any],
+    key: str,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """
+    Walks a backend collection page by page with keyset pagination, so only one
+    page is held in memory at a time. A page the backend fails to return
+    raises ExportAbortedError rather than ending the export early.
+    """
+    page_params = {**params, "limit": settings.MAX_PAGE_SIZE}
+    while True:
+        items = await get_page(params=page_params)
+        if items is None:
+            raise ExportAbortedError(f"Page after {page_params.get('after')} failed")
+        if not items:
+            return
+        yield items
+        if len(items) < settings.MAX_PAGE_SIZE:
+            return
+        page_params = {
+            **{k: v for k, v in page_params.items() if k not in OFFSET_PARAMS},
+            "after": items[-1][key],
+        }
+
+
+async def ndjson_lines(
+    pages: AsyncIterator[List[Dict[str, Any]]]
+) -> AsyncIterator[str]:
+    try:
+        async for page in pages:
+            yield "".join(
+                json.dumps(item, separators=(",", ":"), default=str) + "\n"
+                for item in page
+            )
+    except Exception as e:
+        log.error(f"Export aborted: {e!r}")
+        # Tell NDJSON readers the file is incomplete, then abort the transfer.
+        yield json.dumps({"error": "export aborted"}) + "\n"
+        raise
+
+
+async def csv_lines(pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    fields: Optional[List[str]] = None
+    try:
+        async for page in pages:
+            buffer = io.StringIO()
+            if fields is None:
+                fields = list(page[0].keys())
+                writer = csv.DictWriter(
+                    buffer, fieldnames=fields, extrasaction="ignore"
+                )
+                writer.writeheader()
+            else:
+                writer = csv.DictWriter(
+                    buffer, fieldnames=fields, extrasaction="ignore"
+                )
+            writer.writerows(page)
+            yield buffer.getvalue()
+    except Exception as e:
+        # CSV has no room for a trailer; aborting leaves a truncated transfer.
+        log.error(f"Export aborted: {e!r}")
+        raise
+
+
+def export_response(
+    pages: AsyncIterator[List[Dict[str, Any]]],
+    *,
+    export_format: ExportFormat,
+    filename: str,
+) -> StreamingResponse:
+    lines = (
+        ndjson_lines(pages)
+        if export_format == ExportFormat.ndjson
+        else csv_lines(pages)
+    )
+    return StreamingResponse(
+        lines,
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}.{export_format.value}"'
+        },
+    )
@@ -0,0 +1,56 @@
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.core.config import Settings, get_settings
+
+settings: Settings = get_settings()
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(after: str) -> str:
+    raw = json.dumps({"after": after}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return str(json.loads(raw)["after"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page_size(limit: Optional[int]) -> int:
+    if not limit or limit < 1:
+        return settings.MAX_PAGE_SIZE
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+
+def backend_params(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Query params for a backend list call: empty filters are dropped, the page
+    size is capped at MAX_PAGE_SIZE and an opaque cursor becomes the keyset
+    ``after`` param.
+    """
+    params = {
+        key: value
+        for (key, value) in payload.items()
+        if value not in [None, ""] and key != "cursor"
+    }
+    params["limit"] = page_size(payload.get("limit"))
+    if payload.get("cursor"):
+        params["after"] = decode_cursor(payload["cursor"])
+    return params
+
+
+def next_cursor(
+    items: Optional[List[Dict[str, Any]]], *, limit: Optional[int], key: str
+) -> Optional[str]:
+    if not items or len(items) < page_size(limit):
+        return None
+    return encode_cursor(items[-1][key])
@@ -1,9 +1,12 @@
-import smtplib
+import asyncio
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Union
+from typing import Dict, Iterable, Union
 
 from app.core.config import Settings, get_settings
+from app.infra.smtp.client import smtp_client
+from app.infra.smtp.exceptions import PermanentDeliveryError
+from app.utils.email_templates import render_template
 
 settings: Settings = get_settings()
 
@@ -12,45 +15,65 @@ async def send_email(
     *, email_to: str, subject: str, message: Union[str, MIMEText]
 ) -> bool:
     try:
-        msg = MIMEMultipart()
         # create message object instance
         msg = MIMEMultipart()
         # setup the parameters of the message
-        password = settings.SMTP_PASSWORD
         msg["From"] = settings.SMTP_USER
         msg["To"] = email_to
         msg["Subject"] = subject
         # add in the message body
         msg.attach(message)
-        # create server
-        server = smtplib.SMTP(f"{settings.SMTP_HOST}:{settings.SMTP_PORT}")
-        server.starttls()
-        # Login Credentials for sending the mail
-        server.login(msg["From"], password)
-        # send the message via the server.
-        server.sendmail(msg["From"], msg["To"], msg.as_string())
-        server.quit()
+        # send the message through a pooled, authenticated connection
+        await smtp_client.send(msg)
         return True
+    except PermanentDeliveryError:
+        raise
     except Exception as e:
         print(e)
         return False
 
 
+async def send_bulk_email(
+    *, emails_to: Iterable[str], subject: str, html: str
+) -> Dict[str, bool]:
+    recipients: Dict[str, str] = {}
+    for email_to in emails_to:
+        if email_to:
+            recipients.setdefault(email_to.strip().lower(), email_to)
+    semaphore = asyncio.Semaphore(settings.NOTIFICATION_FANOUT_CONCURRENCY)
+    refused = []
+
+    async def send_one(email_to: str) -> bool:
+        async with semaphore:
+            message = MIMEText(html, "html")
+            try:
+                return await send_email(
+                    email_to=email_to, subject=subject, message=message
+                )
+            except PermanentDeliveryError as e:
+                print(e)
+                refused.append(email_to)
+                return False
+
+    results = await asyncio.gather(*[send_one(e) for e in recipients.values()])
+    # Nothing left worth retrying when every recipient was refused.
+    if recipients and len(refused) == len(recipients):
+        raise PermanentDeliveryError(f"Every recipient was refused: {refused}")
+    return dict(zip(recipients.values(), results))
+
+
 async def send_code_email(*, email_to: str, code: str):
-    with open("./app/email_templates/send_code.html") as f:
-        template_str = f.read()
     subject = "Security Code"
-    message = MIMEText(template_str.format(code=code), "html")
+    message = MIMEText(render_template("send_code.html", code=code), "html")
     flag = await send_email(email_to=email_to, subject=subject, message=message)
     return flag
 
 
 async def send_new_account(*, email_to: str, name: str, username: str):
-    with open("./app/email_templates/new_account.html") as f:
-        template_str = f.read()
     subject = "Thanks for Create a new Account"
     message = MIMEText(
-        template_str.format(
+        render_template(
+            "new_account.html",
             name=name,
             username=username,
             password="Ask for the password to the assistant",
@@ -64,11 +87,10 @@ async def send_new_account(*, email_to: str, name: str, username: str):
 async def send_assigned_vehicle(
     *, email_to: str, plate: str, brand: str, model: str, color: str, vehicle_type: str
 ):
-    with open("./app/email_templates/assigned_vehicle.html") as f:
-        template_str = f.read()
     subject = "A vehicle has been assigned"
     message = MIMEText(
-        template_str.format(
+        render_template(
+            "assigned_vehicle.html",
             plate=plate,
             brand=brand,
             model=model,
@@ -82,11 +104,9 @@ async def send_assigned_vehicle(
 
 
 async def send_updated_personal_information(*, email_to: str):
-    with open("./app/email_templates/updated_personal_information.html") as f:
-        template_str = f.read()
     subject = "Update Personal Information"
     message = MIMEText(
-        template_str.format(),
+        render_template("updated_personal_information.html"),
         "html",
     )
     flag = await send_email(email_to=email_to, subject=subject, message=message)
@@ -94,12 +114,9 @@ async def send_updated_personal_information(*, email_to: str):
 
 
 async def send_reparation_detail(*, email_to: str, description: str, cost: float):
-
-    with open("./app/email_templates/reparation_detail.html") as f:
-        template_str = f.read()
     subject = "New Reparation Detail"
     message = MIMEText(
-        template_str.format(description=description, cost=cost),
+        render_template("reparation_detail.html", description=description, cost=cost),
         "html",
     )
     flag = await send_email(email_to=email_to, subject=subject, message=message)
@@ -109,11 +126,10 @@ async def send_reparation_detail(*, email_to: str, description: str, cost: float
 async def send_new_owner(
     *, email_to: str, identity_card: str, name: str, surname: str, phone: str
 ):
-    with open("./app/email_templates/new_owner.html") as f:
-        template_str = f.read()
     subject = "New account created successfully"
     message = MIMEText(
-        template_str.format(
+        render_template(
+            "new_owner.html",
             identity_card=identity_card,
             name=name,
             surname=surname,
@@ -127,12 +143,24 @@ async def send_new_owner(
 
 
 async def send_updated_vehicle(*, email_to: str):
-    with open("./app/email_templates/updated_vehicle.html") as f:
-        template_str = f.read()
     subject = "Update Vehicle Information"
     message = MIMEText(
-        template_str.format(),
+        render_template("updated_vehicle.html"),
         "html",
     )
     flag = await send_email(email_to=email_to, subject=subject, message=message)
     return flag
+
+
+async def send_bulk_updated_vehicle(*, emails_to: Iterable[str]) -> Dict[str, bool]:
+    subject = "Update Vehicle Information"
+    html = render_template("updated_vehicle.html")
+    return await send_bulk_email(emails_to=emails_to, subject=subject, html=html)
+
+
+async def send_bulk_reparation_detail(
+    *, emails_to: Iterable[str], description: str, cost: float
+) -> Dict[str, bool]:
+    subject = "New Reparation Detail"
+    html = render_template("reparation_detail.html", description=description, cost=cost)
+    return await send_bulk_email(emails_to=emails_to, subject=subject, html=html)
@@ -0,0 +1,128 @@
+"""
+Latency of create_employee_admin and create_owner_vehicle against a stubbed
+backend that answers every call after BACKEND_LATENCY. "serial" runs the same
+service calls one after another, as the handlers did before their pre-checks
+went through gather_or_cancel; "handler" runs the handlers themselves.
+
+Entity caches are cleared before every run so each lookup reaches the stub,
+notifications are not queued, and password hashing is replaced by a no-op so
+bcrypt doesn't drown the backend round trips.
+
+Run from the repository root with the usual environment variables set:
+
+    python -m benchmarks.bench_create_prechecks
+"""
+
+import asyncio
+import time
+
+from httpx import Request, Response
+
+from app.api.api_v1.endpoints import employee, vehicle
+from app.infra.httpx.client import HTTPXClient
+from app.schemas.employee import CreateEmployee
+from app.services import employee as employee_module
+from app.services.employee import employee_service
+from app.services.notification import notification_outbox
+from app.services.owner import owner_service
+from app.services.vehicle import vehicle_service
+
+BACKEND_LATENCY = 0.02
+ITERATIONS = 20
+
+VEHICLE = {
+    "plate": "ABC123",
+    "brand": "brand",
+    "model": "model",
+    "color": "color",
+    "vehicle_type": "car",
+}
+OWNER = {"identity_card": "2002", "email": "owner@example.com"}
+EMPLOYEE_IN = CreateEmployee(
+    identity_card="3003",
+    names="names",
+    surnames="surnames",
+    phone="300",
+    email="employee@example.com",
+    username="employee",
+    role="technician",
+    password="secret",
+)
+TECHNICIAN = {"identity_card": "1001", "role": "technician", "is_active": True}
+
+
+class StubBackend:
+    """Finds the vehicle and the owner, not the new employee; creates anything."""
+
+    async def request(self, method, url, **kwargs):
+        await asyncio.sleep(BACKEND_LATENCY)
+        request = Request(method, url)
+        if method == "POST":
+            return Response(201, json={}, request=request)
+        if url.endswith("/vehicles/ABC123"):
+            return Response(200, json=VEHICLE, request=request)
+        if url.endswith("/owners/2002"):
+            return Response(200, json=OWNER, request=request)
+        return Response(404, json={}, request=request)
+
+
+async def fake_hash(password: str) -> str:
+    return password
+
+
+async def clear_caches() -> None:
+    for service in (employee_service, owner_service, vehicle_service):
+        await service.cache.clear()
+
+
+async def serial_owner_vehicle() -> None:
+    await vehicle_service.get_by_plate(vehicle_id="ABC123")
+    await owner_service.get_by_id(owner_id="2002")
+    await vehicle_service.create_owner_vehicle(vehicle_id="ABC123", owner_id="2002")
+
+
+async def handler_owner_vehicle() -> None:
+    await vehicle.create_owner_vehicle(
+        vehicle_id="ABC123", owner_id="2002", current_employee=TECHNICIAN
+    )
+
+
+async def serial_employee() -> None:
+    await employee_service.get_by_username(username=EMPLOYEE_IN.username)
+    await employee_service.get_by_id(employee_id=EMPLOYEE_IN.identity_card)
+    await employee_service.create(employee_in=EMPLOYEE_IN.copy())
+
+
+async def handler_employee() -> None:
+    await employee.create_employee_admin(
+        employee_in=EMPLOYEE_IN.copy(), current_employee=TECHNICIAN
+    )
+
+
+async def measure(func) -> float:
+    total = 0.0
+    for _ in range(ITERATIONS):
+        await clear_caches()
+        start = time.perf_counter()
+        await func()
+        total += time.perf_counter() - start
+    return total / ITERATIONS
+
+
+def main() -> None:
+    HTTPXClient.get_client = staticmethod(StubBackend)
+    notification_outbox.enqueue = lambda send, **kwargs: None
+    employee_module.async_get_password_hash = fake_hash
+    loop = asyncio.get_event_loop()
+    for name, func in (
+        ("create_owner_vehicle serial", serial_owner_vehicle),
+        ("create_owner_vehicle handler", handler_owner_vehicle),
+        ("create_employee_admin serial", serial_employee),
+        ("create_employee_admin handler", handler_employee),
+    ):
+        seconds = loop.run_until_complete(measure(func))
+        print(f"{name:>29}: {seconds * 1e3:8.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Per-request auth overhead of decoding a bearer token, with and without the
+decoded-token cache in app.api.deps.
+
+Run from the repository root with the usual environment variables set:
+
+    python -m benchmarks.bench_token_cache
+"""
+
+import timeit
+
+from app.api import deps
+from app.core import security
+from app.schemas.token import TokenPayload
+
+ITERATIONS = 20000
+
+
+def uncached(token: str) -> None:
+    deps.token_cache.clear()
+    deps.decode_token(token, TokenPayload)
+
+
+def cached(token: str) -> None:
+    deps.decode_token(token, TokenPayload)
+
+
+def main() -> None:
+    token = security.create_access_token("1001")
+    for name, func in (("uncached", uncached), ("cached", cached)):
+        seconds = timeit.timeit(lambda: func(token), number=ITERATIONS)
+        print(f"{name:>9}: {seconds / ITERATIONS * 1e6:8.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
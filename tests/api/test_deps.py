@@ -0,0 +1,62 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.api import deps
+from app.core import security
+from app.schemas.token import OwnerTokenPayload, TokenPayload
+
+
+def test_stateless_token_authorizes_from_claims(monkeypatch):
+    monkeypatch.setattr(deps.settings, "STATELESS_AUTH", True)
+    monkeypatch.setattr(security.token_revocations, "_versions", {})
+    token = security.create_access_token(
+        "1001",
+        claims={"role": "manager", "is_active": True, "ver": 0},
+    )
+    loop = asyncio.get_event_loop()
+
+    employee = loop.run_until_complete(deps.get_current_employee(token=token))
+    assert employee["identity_card"] == "1001"
+    assert deps.get_current_manager(deps.get_current_active_employee(employee))
+
+    loop.run_until_complete(security.token_revocations.revoke("1001"))
+    with pytest.raises(HTTPException):
+        loop.run_until_complete(deps.get_current_employee(token=token))
+
+
+def test_cached_token_is_dropped_when_it_expires(monkeypatch):
+    decoded = []
+    decode = deps.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decoded.append(1)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(deps.jwt, "decode", counting_decode)
+    token = security.create_access_token("1001", expires_delta=timedelta(seconds=30))
+
+    deps.decode_token(token, OwnerTokenPayload)
+    deps.decode_token(token, OwnerTokenPayload)
+    assert len(decoded) == 1
+
+    # Past the token's exp, well within the cache's own TTL.
+    now = time.monotonic() + 31
+    monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now)
+    deps.decode_token(token, OwnerTokenPayload)
+    assert len(decoded) == 2
+
+
+def test_token_cache_is_keyed_by_schema():
+    # No exp claim: a valid employee payload, not a valid owner payload.
+    token = jwt.encode(
+        {"sub": "1001"}, deps.settings.SECRET_KEY, algorithm=deps.settings.ALGORITHM
+    )
+
+    assert deps.decode_token(token, TokenPayload).sub == "1001"
+    with pytest.raises(HTTPException):
+        deps.decode_token(token, OwnerTokenPayload)
@@ -0,0 +1,30 @@
+import asyncio
+
+from app.api.api_v1.endpoints import vehicle
+from app.services.reparation_details import reparation_detail_service
+from app.services.vehicle import vehicle_service
+
+
+def test_dossier_returns_partial_result_on_timeout(monkeypatch):
+    monkeypatch.setattr(vehicle.settings, "DOSSIER_PART_TIMEOUT_SECONDS", 0.05)
+
+    async def get_by_plate(*, vehicle_id):
+        return {"id_vehicle": vehicle_id}
+
+    async def get_vehicle_owners(*, vehicle_id):
+        return []
+
+    async def get_by_vehicle(*, vehicle_id):
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(vehicle_service, "get_by_plate", get_by_plate)
+    monkeypatch.setattr(vehicle_service, "get_vehicle_owners", get_vehicle_owners)
+    monkeypatch.setattr(reparation_detail_service, "get_by_vehicle", get_by_vehicle)
+
+    dossier = asyncio.get_event_loop().run_until_complete(
+        vehicle.get_vehicle_dossier(vehicle_id="ABC123", current_employee=None)
+    )
+    assert dossier["vehicle"] == {"id_vehicle": "ABC123"}
+    assert dossier["owners"] == []
+    assert dossier["reparation_details"] is None
+    assert dossier["missing"] == ["reparation_details"]
@@ -1,6 +1,8 @@
 import pytest
 from starlette.testclient import TestClient
 
+from app.core.batch_loader import batch_loaders
+from app.core.cache import entity_caches
 from app.main import create_application
 
 
@@ -13,3 +15,14 @@ def test_app():
 
         # testing
         yield test_client
+
+
+@pytest.fixture(autouse=True)
+def restore_registries():
+    # Tests build their own caches and loaders; don't leave them registered.
+    caches, loaders = dict(entity_caches), dict(batch_loaders)
+    yield
+    entity_caches.clear()
+    entity_caches.update(caches)
+    batch_loaders.clear()
+    batch_loaders.update(loaders)
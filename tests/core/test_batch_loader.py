@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.core.batch_loader import BatchLoader
+
+
+def test_batch_loader_resolves_concurrent_keys_together():
+    batches = []
+
+    async def load_many(keys):
+        batches.append(sorted(keys))
+        return {key: {"id": key} for key in keys if key != "missing"}
+
+    loader = BatchLoader(
+        name="test-bulk",
+        load_one=None,
+        load_many=load_many,
+        window=0.001,
+        max_batch=2,
+    )
+
+    async def load_all():
+        return await asyncio.gather(
+            *[loader.load(key) for key in ("a", "b", "a", "missing")]
+        )
+
+    results = asyncio.get_event_loop().run_until_complete(load_all())
+    assert results == [{"id": "a"}, {"id": "b"}, {"id": "a"}, None]
+    assert sorted(batches) == [["a", "b"], ["missing"]]
+
+
+def test_batch_loader_without_bulk_lookup_skips_the_window():
+    loaded = []
+
+    async def load_one(key):
+        loaded.append(key)
+        return key.upper()
+
+    loader = BatchLoader(name="test-single", load_one=load_one, window=60, max_batch=10)
+
+    result = asyncio.get_event_loop().run_until_complete(
+        asyncio.wait_for(loader.load("a"), timeout=1)
+    )
+    assert result == "A"
+    assert loaded == ["a"]
+    assert loader.batches == 0
+
+
+def test_batch_loader_cancels_callers_when_the_batch_is_cancelled():
+    async def load_many(keys):
+        raise asyncio.CancelledError()
+
+    loader = BatchLoader(
+        name="test-cancel", load_one=None, load_many=load_many, window=0, max_batch=10
+    )
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.get_event_loop().run_until_complete(loader.load("a"))
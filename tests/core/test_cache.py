@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+from app.core import identity_map
+from app.core.cache import ReadThroughCache, TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["hits"] == 3
+    assert cache.stats()["misses"] == 1
+
+
+def test_ttl_cache_expires_and_invalidates():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1, ttl=0.01)
+    cache.set("b", 2)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    cache.invalidate("b")
+    assert cache.get("b") is None
+    assert len(cache) == 0
+
+
+def test_read_through_cache_loads_once_and_skips_misses():
+    cache = ReadThroughCache(name="test", maxsize=10, ttl=60)
+    loads = []
+
+    async def load(key):
+        loads.append(key)
+        return {"id": key} if key != "missing" else None
+
+    async def run():
+        for key in ("a", "a", "missing", "missing"):
+            await cache.get_or_load(key, lambda: load(key))
+        await cache.invalidate("a")
+        await cache.get_or_load("a", lambda: load("a"))
+
+    asyncio.get_event_loop().run_until_complete(run())
+    assert loads == ["a", "missing", "missing", "a"]
+
+
+def test_identity_map_loads_each_entity_once_per_request():
+    cache = ReadThroughCache(name="test-identity", maxsize=10, ttl=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return {"id": "a", "version": len(loads)}
+
+    async def request():
+        identity_map.set_scope({})
+        first = await cache.get_or_load("a", loader)
+        # Evicted from this worker's cache, still the request's copy.
+        cache._cache.invalidate("a")
+        again = await cache.get_or_load("a", loader)
+        await cache.clear()
+        second = await cache.get_or_load("a", loader)
+        await cache.invalidate("a")
+        third = await cache.get_or_load("a", loader)
+        return first, again, second, third
+
+    loop = asyncio.get_event_loop()
+    first, again, second, third = loop.run_until_complete(request())
+    assert first is again
+    assert second["version"] == 2
+    assert third["version"] == 3
+    assert len(loads) == 3
+
+
+def test_read_through_cache_remembers_misses_until_invalidated():
+    cache = ReadThroughCache(name="test-negative", maxsize=10, ttl=60, negative_ttl=60)
+    loads = []
+
+    async def missing():
+        loads.append(1)
+        return None
+
+    async def found():
+        loads.append(1)
+        return {"id": "a"}
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(cache.get_or_load("a", missing)) is None
+    assert loop.run_until_complete(cache.get_or_load("a", found)) is None
+    assert len(loads) == 1
+    loop.run_until_complete(cache.invalidate("a"))
+    assert loop.run_until_complete(cache.get_or_load("a", found)) == {"id": "a"}
+    assert len(loads) == 2
+    assert cache.stats()["negative"]["hits"] == 1
+
+
+def test_read_through_cache_serves_stale_while_one_refresh_runs():
+    cache = ReadThroughCache(name="test-stale", maxsize=10, ttl=0.05, stale_ttl=60)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0.01)
+        return {"version": len(loads)}
+
+    async def scenario():
+        first = await cache.get_or_load("a", loader)
+        await asyncio.sleep(0.06)
+        stale = await asyncio.gather(
+            *[cache.get_or_load("a", loader) for _ in range(5)]
+        )
+        await asyncio.sleep(0.02)
+        fresh = await cache.get_or_load("a", loader)
+        return first, stale, fresh
+
+    first, stale, fresh = asyncio.get_event_loop().run_until_complete(scenario())
+    assert first == {"version": 1}
+    assert stale == [{"version": 1}] * 5
+    assert fresh == {"version": 2}
+    assert len(loads) == 2
+    assert cache.stats()["refreshes"] == 1
+    assert cache.stats()["stale_served"] == 5
@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+from app.core import deadline
+
+
+def test_budget_uses_longest_matching_route_prefix():
+    assert deadline.budget_for("/api/v1/login/access-token") == 20.0
+    assert (
+        deadline.budget_for("/api/v1/vehicles")
+        == deadline.settings.REQUEST_DEADLINE_SECONDS
+    )
+    assert deadline.budget_for("/api/v1/vehicles/batch") == 120.0
+    assert deadline.budget_for("/api/v1/vehicles/batch/") == 120.0
+    assert (
+        deadline.budget_for("/api/v1/vehicles/batchA1")
+        == deadline.settings.REQUEST_DEADLINE_SECONDS
+    )
+
+
+def test_timeout_is_clamped_to_the_remaining_budget():
+    deadline.set_deadline(None)
+    assert deadline.timeout_for(40) == 40
+
+    deadline.set_deadline(0.5)
+    assert deadline.timeout_for(40) <= 0.5
+
+    deadline.set_deadline(0.001)
+    time.sleep(0.002)
+    with pytest.raises(deadline.DeadlineExceededError):
+        deadline.timeout_for(40)
+    deadline.set_deadline(None)
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from app.core import degraded
+from app.core.cache import ReadThroughCache
+from app.core.config import get_settings
+from app.infra.httpx.client import HTTPXClient
+from app.infra.httpx.exceptions import BackendUnavailableError
+
+
+def test_cache_serves_last_known_good_when_backend_is_down():
+    cache = ReadThroughCache(
+        name="test-degraded",
+        maxsize=10,
+        ttl=0,
+        fallback_on=(BackendUnavailableError,),
+        last_good_ttl=60,
+    )
+
+    async def found():
+        return {"id": "a"}
+
+    async def down():
+        raise BackendUnavailableError("down")
+
+    async def request():
+        sources = set()
+        degraded._sources.set(sources)
+        await cache.get_or_load("a", found)
+        value = await cache.get_or_load("a", down)
+        with pytest.raises(BackendUnavailableError):
+            await cache.get_or_load("b", down)
+        return value, sources
+
+    value, sources = asyncio.get_event_loop().run_until_complete(request())
+    assert value == {"id": "a"}
+    assert sources == {"test-degraded"}
+
+
+def test_writes_are_rejected_while_the_backend_circuit_is_open(test_app):
+    breaker = HTTPXClient.get_breaker(get_settings().DATABASE_URL)
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    try:
+        response = test_app.post("/api/v1/owners", json={})
+        assert response.status_code == 503
+        assert "Retry-After" in response.headers
+        assert test_app.get("/api/v1/status").status_code == 200
+    finally:
+        breaker.record_success()
@@ -0,0 +1,82 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from app.core import security
+from app.core.security import (
+    async_get_password_hash,
+    async_verify_password,
+    password_hasher,
+)
+from app.core.shared_cache import SharedCache, SharedCacheError
+
+
+def test_password_hash_runs_off_the_event_loop():
+    async def run():
+        hashed = await async_get_password_hash("secret")
+        results = await asyncio.gather(
+            async_verify_password("secret", hashed),
+            async_verify_password("wrong", hashed),
+        )
+        return results
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(run()) == [True, False]
+    assert password_hasher.waiting == 0
+    assert password_hasher.running == 0
+
+
+def test_metrics(test_app):
+    response = test_app.get("/api/v1/status/metrics")
+    assert response.status_code == 200
+    assert "password_hasher" in response.json()
+
+
+def test_token_revocations_are_shared_between_workers(tmp_path):
+    def worker():
+        shared = SharedCache(
+            path=str(tmp_path / "cache.sqlite3"),
+            poll_interval=1,
+            busy_timeout=0.05,
+            log_retention=60,
+        )
+        return security.TokenRevocations(shared=shared)
+
+    async def run():
+        first, second = worker(), worker()
+        await first.revoke("1001")
+        assert await second.current("1001") == 1
+        assert await second.is_revoked("1001", 0)
+        assert not await second.is_revoked("1001", 1)
+        await second.revoke("1001")
+        assert await first.current("1001") == 2
+        await first.shared.stop()
+        await second.shared.stop()
+
+    asyncio.get_event_loop().run_until_complete(run())
+
+
+def test_token_revocations_fail_closed_when_the_shared_cache_is_locked(
+    tmp_path, monkeypatch
+):
+    shared = SharedCache(
+        path=str(tmp_path / "cache.sqlite3"),
+        poll_interval=1,
+        busy_timeout=0.05,
+        log_retention=60,
+    )
+    revocations = security.TokenRevocations(shared=shared)
+
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(shared, "_connect", locked)
+
+    async def run():
+        with pytest.raises(SharedCacheError):
+            await revocations.revoke("1001")
+        assert await revocations.is_revoked("1001", 0)
+        await shared.stop()
+
+    asyncio.get_event_loop().run_until_complete(run())
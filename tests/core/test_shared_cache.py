@@ -0,0 +1,77 @@
+import asyncio
+import threading
+
+from app.core.cache import ReadThroughCache
+from app.core.shared_cache import SharedCache
+
+
+def make_shared(path):
+    return SharedCache(
+        path=str(path), poll_interval=0.1, busy_timeout=0.05, log_retention=60
+    )
+
+
+def test_shared_cache_is_read_behind_each_worker_cache(tmp_path, monkeypatch):
+    path = tmp_path / "cache.sqlite3"
+    first = ReadThroughCache(
+        name="test-shared", maxsize=10, ttl=60, shared=make_shared(path)
+    )
+    second_shared = make_shared(path)
+    second = ReadThroughCache(
+        name="test-shared", maxsize=10, ttl=60, shared=second_shared
+    )
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return {"id": 5, "version": len(loads)}
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(first.get_or_load(5, loader))["version"] == 1
+    assert loop.run_until_complete(second.get_or_load(5, loader))["version"] == 1
+    assert len(loads) == 1
+
+    # Pretend the other cache lives in another process.
+    monkeypatch.setattr("app.core.shared_cache.os.getpid", lambda: -1)
+    loop.run_until_complete(first.invalidate(5))
+    monkeypatch.undo()
+    loop.run_until_complete(second_shared.sync())
+
+    assert loop.run_until_complete(second.get_or_load(5, loader))["version"] == 2
+    assert len(loads) == 2
+
+
+def test_shared_hit_is_kept_only_as_long_as_it_lives_there(tmp_path):
+    path = tmp_path / "cache.sqlite3"
+    first = ReadThroughCache(
+        name="test-shared-ttl", maxsize=10, ttl=0.3, shared=make_shared(path)
+    )
+    second_shared = make_shared(path)
+    second = ReadThroughCache(
+        name="test-shared-ttl", maxsize=10, ttl=0.3, shared=second_shared
+    )
+    loads = []
+    threads = []
+
+    async def loader():
+        loads.append(1)
+        return {"id": 5, "version": len(loads)}
+
+    original_get = second_shared._get
+
+    def get(*args):
+        threads.append(threading.current_thread())
+        return original_get(*args)
+
+    second_shared._get = get
+
+    async def run():
+        await first.get_or_load(5, loader)
+        await asyncio.sleep(0.2)
+        assert (await second.get_or_load(5, loader))["version"] == 1
+        # The shared copy expires ~0.1s later; a fresh ttl would last 0.3s.
+        await asyncio.sleep(0.15)
+        return await second.get_or_load(5, loader)
+
+    assert asyncio.get_event_loop().run_until_complete(run())["version"] == 2
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,19 @@
+import time
+
+from app.infra.httpx.circuit_breaker import CircuitBreaker
+
+
+def test_breaker_opens_and_recovers_after_probe():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.01)
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow_request()
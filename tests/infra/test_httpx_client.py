@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from httpx import ConnectError, ReadTimeout, Request, Response
+
+from app.core import deadline
+from app.infra.httpx.client import HTTPXClient, settings
+from app.infra.httpx.exceptions import BackendUnavailableError
+
+
+def test_concurrent_identical_gets_share_one_call(monkeypatch):
+    calls = []
+
+    async def fake_get(self, *, url_service, params, **kwargs):
+        calls.append((url_service, params))
+        await asyncio.sleep(0.01)
+        return {"url": url_service}
+
+    monkeypatch.setattr(HTTPXClient, "_get", fake_get)
+    client = HTTPXClient()
+    collapsed = HTTPXClient.collapsed
+
+    async def run():
+        return await asyncio.gather(
+            client.get(url_service="http://db/a", status_response=200),
+            client.get(url_service="http://db/a", status_response=200),
+            client.get(url_service="http://db/a", status_response=200, params={"x": 1}),
+        )
+
+    results = asyncio.get_event_loop().run_until_complete(run())
+    assert results[0] == results[1] == results[2] == {"url": "http://db/a"}
+    assert len(calls) == 2
+    assert HTTPXClient.collapsed - collapsed == 1
+
+
+def test_unavailable_backend_raises_instead_of_returning_none(monkeypatch):
+    attempts = []
+
+    class FailingClient:
+        async def request(self, method, url, **kwargs):
+            attempts.append(method)
+            raise ConnectError("connection refused")
+
+    monkeypatch.setattr(HTTPXClient, "get_client", staticmethod(FailingClient))
+    monkeypatch.setattr(HTTPXClient, "_breakers", {})
+    monkeypatch.setattr(settings, "BACKEND_RETRY_BACKOFF_SECONDS", 0)
+    client = HTTPXClient()
+    loop = asyncio.get_event_loop()
+
+    with pytest.raises(BackendUnavailableError):
+        loop.run_until_complete(
+            client.get(url_service="http://db/b", status_response=200)
+        )
+    with pytest.raises(BackendUnavailableError):
+        loop.run_until_complete(
+            client.post(url_service="http://db/b", status_response=201)
+        )
+    assert attempts == ["GET"] * settings.BACKEND_RETRY_ATTEMPTS + ["POST"]
+
+
+def test_half_open_probe_is_released_when_the_deadline_expires(monkeypatch):
+    class SlowClient:
+        async def request(self, method, url, **kwargs):
+            await asyncio.sleep(kwargs["timeout"])
+            raise ReadTimeout("timed out")
+
+    monkeypatch.setattr(HTTPXClient, "get_client", staticmethod(SlowClient))
+    monkeypatch.setattr(HTTPXClient, "_breakers", {})
+    breaker = HTTPXClient.get_breaker("http://db/c")
+    breaker.state = breaker.OPEN
+    breaker.opened_at = 0.0
+    client = HTTPXClient()
+
+    async def probe():
+        deadline.set_deadline(0.01)
+        await client.get(url_service="http://db/c", status_response=200)
+
+    with pytest.raises(deadline.DeadlineExceededError):
+        asyncio.get_event_loop().run_until_complete(probe())
+    assert breaker.allow_request()
+
+
+def test_shared_get_followers_keep_their_own_deadline(monkeypatch):
+    calls = []
+
+    async def fake_get(self, *, url_service, **kwargs):
+        calls.append(url_service)
+        await asyncio.sleep(0.05)
+        if deadline.expired():
+            raise deadline.DeadlineExceededError("leader ran out")
+        return {"url": url_service}
+
+    monkeypatch.setattr(HTTPXClient, "_get", fake_get)
+    client = HTTPXClient()
+
+    async def get(budget, delay=0):
+        await asyncio.sleep(delay)
+        deadline.set_deadline(budget)
+        return await client.get(url_service="http://db/d", status_response=200)
+
+    async def run():
+        return await asyncio.gather(
+            get(0.01),
+            get(None, delay=0.001),
+            get(0.02, delay=0.001),
+            return_exceptions=True,
+        )
+
+    leader, patient, hasty = asyncio.get_event_loop().run_until_complete(run())
+    assert isinstance(leader, deadline.DeadlineExceededError)
+    assert patient == {"url": "http://db/d"}
+    assert isinstance(hasty, deadline.DeadlineExceededError)
+    assert len(calls) == 2
+
+
+def test_internal_server_errors_do_not_open_the_breaker(monkeypatch):
+    class ErroringClient:
+        async def request(self, method, url, **kwargs):
+            return Response(500, json={}, request=Request(method, url))
+
+    monkeypatch.setattr(HTTPXClient, "get_client", staticmethod(ErroringClient))
+    monkeypatch.setattr(HTTPXClient, "_breakers", {})
+    client = HTTPXClient()
+
+    async def run():
+        return [
+            await client.post(url_service="http://db/e", status_response=201)
+            for _ in range(settings.BACKEND_BREAKER_FAILURE_THRESHOLD)
+        ]
+
+    results = asyncio.get_event_loop().run_until_complete(run())
+    assert results == [None] * settings.BACKEND_BREAKER_FAILURE_THRESHOLD
+    assert not HTTPXClient.get_breaker("http://db/e").is_open()
@@ -0,0 +1,97 @@
+import asyncio
+import smtplib
+from email.message import Message
+
+import pytest
+
+from app.infra.smtp import client as smtp_module
+from app.infra.smtp.client import SMTPClient
+from app.infra.smtp.exceptions import PermanentDeliveryError
+
+
+class FakeSMTP:
+    instances = []
+    # Exceptions raised by the next send_message calls, in order.
+    failures = []
+
+    def __init__(self, host, port, timeout):
+        self.sent = []
+        self.closed = False
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, user, password):
+        pass
+
+    def send_message(self, msg):
+        if FakeSMTP.failures:
+            raise FakeSMTP.failures.pop(0)
+        self.sent.append(msg)
+
+    def quit(self):
+        self.closed = True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def smtp_client(monkeypatch):
+    FakeSMTP.instances = []
+    FakeSMTP.failures = []
+    monkeypatch.setattr(smtp_module.smtplib, "SMTP", FakeSMTP)
+    client = SMTPClient(
+        host="smtp", port=587, user="user", password="secret", pool_size=2, timeout=5
+    )
+    yield client
+    asyncio.get_event_loop().run_until_complete(client.close())
+
+
+def send(client, msg=None):
+    asyncio.get_event_loop().run_until_complete(client.send(msg or Message()))
+
+
+def test_connections_are_checked_out_and_reused(smtp_client):
+    send(smtp_client)
+    send(smtp_client)
+
+    assert len(FakeSMTP.instances) == 1
+    assert len(FakeSMTP.instances[0].sent) == 2
+    assert smtp_client.stats()["idle"] == 1
+    assert smtp_client.sent == 2
+
+
+def test_dropped_connection_is_reconnected_once(smtp_client):
+    send(smtp_client)
+    FakeSMTP.failures = [smtplib.SMTPServerDisconnected("idle too long")]
+    send(smtp_client)
+
+    stale, fresh = FakeSMTP.instances
+    assert stale.closed
+    assert len(fresh.sent) == 1
+    assert smtp_client.reconnects == 1
+    assert smtp_client.stats()["idle"] == 1
+
+
+def test_broken_connection_is_discarded(smtp_client):
+    FakeSMTP.failures = [smtplib.SMTPDataError(451, b"try again later")]
+    with pytest.raises(smtplib.SMTPDataError):
+        send(smtp_client)
+
+    assert FakeSMTP.instances[0].closed
+    assert smtp_client.stats()["idle"] == 0
+    send(smtp_client)
+    assert len(FakeSMTP.instances) == 2
+
+
+def test_refusals_are_permanent(smtp_client):
+    FakeSMTP.failures = [
+        smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"no such user")}),
+        smtplib.SMTPDataError(554, b"rejected"),
+    ]
+    for _ in range(2):
+        with pytest.raises(PermanentDeliveryError):
+            send(smtp_client)
+    assert smtp_client.stats()["idle"] == 0
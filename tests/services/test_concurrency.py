@@ -0,0 +1,28 @@
+import asyncio
+
+import pytest
+
+from app.services.concurrency import gather_or_cancel
+
+
+def test_gather_or_cancel_cancels_siblings_on_failure():
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def failing():
+        raise ValueError("boom")
+
+    async def ok():
+        return 1
+
+    loop = asyncio.get_event_loop()
+    assert loop.run_until_complete(gather_or_cancel(ok(), ok())) == [1, 1]
+    with pytest.raises(ValueError):
+        loop.run_until_complete(gather_or_cancel(slow(), failing()))
+    assert cancelled == [True]
@@ -0,0 +1,148 @@
+import asyncio
+
+from app.infra.httpx.exceptions import BackendUnavailableError
+from app.infra.smtp.exceptions import PermanentDeliveryError
+from app.services import notification
+from app.services.notification import NotificationOutbox
+from app.utils.send_email import send_bulk_updated_vehicle
+
+
+def test_outbox_retries_and_dead_letters():
+    sent = []
+
+    async def send_ok(*, email_to):
+        sent.append(email_to)
+        return True
+
+    async def send_fail(*, email_to):
+        return False
+
+    async def run():
+        outbox = NotificationOutbox(
+            workers=2,
+            batch_size=5,
+            max_retries=2,
+            retry_backoff=0.001,
+            dead_letter_size=10,
+        )
+        outbox.enqueue(send_ok, email_to="a@example.com")
+        outbox.enqueue(send_fail, email_to="b@example.com")
+        await outbox.stop(timeout=5)
+        return outbox
+
+    outbox = asyncio.get_event_loop().run_until_complete(run())
+    assert sent == ["a@example.com"]
+    assert outbox.delivered == 1
+    assert outbox.retried == 2
+    assert outbox.failed == 1
+    assert outbox.dead_letters[0].kwargs == {"email_to": "b@example.com"}
+
+
+def test_outbox_retry_does_not_hold_up_the_batch():
+    async def send_ok(*, email_to):
+        return True
+
+    async def send_fail(*, email_to):
+        return False
+
+    async def run():
+        outbox = NotificationOutbox(
+            workers=1,
+            batch_size=1,
+            max_retries=3,
+            retry_backoff=0.2,
+            dead_letter_size=10,
+        )
+        outbox.enqueue(send_fail, email_to="a@example.com")
+        outbox.enqueue(send_ok, email_to="b@example.com")
+        await asyncio.sleep(0.05)
+        delivered = outbox.delivered
+        await outbox.stop(timeout=0)
+        return delivered
+
+    assert asyncio.get_event_loop().run_until_complete(run()) == 1
+
+
+def test_outbox_dead_letters_permanent_failures_at_once():
+    async def send_refused(*, email_to):
+        raise PermanentDeliveryError("Recipients refused")
+
+    async def run():
+        outbox = NotificationOutbox(
+            workers=1,
+            batch_size=5,
+            max_retries=3,
+            retry_backoff=0.001,
+            dead_letter_size=10,
+        )
+        outbox.enqueue(send_refused, email_to="a@example.com")
+        await outbox.stop(timeout=5)
+        return outbox
+
+    outbox = asyncio.get_event_loop().run_until_complete(run())
+    assert outbox.retried == 0
+    assert outbox.dead_letters[0].attempts == 1
+
+
+def test_notify_vehicle_owners_deduplicates_recipients(monkeypatch):
+    async def get_vehicle_owners(*, vehicle_id):
+        return [
+            {"email": "ana@example.com"},
+            {"email": "ANA@example.com "},
+            {"email": "luis@example.com"},
+        ]
+
+    calls = []
+
+    async def send_email(*, email_to, subject, message):
+        calls.append(email_to)
+        return True
+
+    monkeypatch.setattr(
+        notification.vehicle_service, "get_vehicle_owners", get_vehicle_owners
+    )
+    monkeypatch.setattr("app.utils.send_email.send_email", send_email)
+
+    results = asyncio.get_event_loop().run_until_complete(
+        notification.notify_vehicle_owners(
+            vehicle_id="ABC123", send_bulk=send_bulk_updated_vehicle
+        )
+    )
+    assert results == {"ana@example.com": True, "luis@example.com": True}
+    assert sorted(calls) == ["ana@example.com", "luis@example.com"]
+
+
+def test_notify_vehicle_owners_retries_only_unreachable_backends(monkeypatch):
+    lookups = []
+
+    async def get_vehicle_owners(*, vehicle_id):
+        lookups.append(vehicle_id)
+        if vehicle_id == "DOWN1":
+            raise BackendUnavailableError("Circuit open")
+        return None
+
+    monkeypatch.setattr(
+        notification.vehicle_service, "get_vehicle_owners", get_vehicle_owners
+    )
+
+    async def run():
+        outbox = NotificationOutbox(
+            workers=1,
+            batch_size=1,
+            max_retries=1,
+            retry_backoff=0.001,
+            dead_letter_size=10,
+        )
+        for vehicle_id in ("NONE1", "DOWN1"):
+            outbox.enqueue(
+                notification.notify_vehicle_owners,
+                vehicle_id=vehicle_id,
+                send_bulk=send_bulk_updated_vehicle,
+            )
+        await outbox.stop(timeout=5)
+        return outbox
+
+    outbox = asyncio.get_event_loop().run_until_complete(run())
+    assert lookups == ["NONE1", "DOWN1", "DOWN1"]
+    assert outbox.delivered == 1
+    assert [item.kwargs["vehicle_id"] for item in outbox.dead_letters] == ["DOWN1"]
@@ -0,0 +1,67 @@
+import asyncio
+
+from app.services import owner as owner_module
+from app.services.owner import owner_service
+from app.services.owner_summary import owner_summary_cache
+from app.services.reparation_details import reparation_detail_service
+
+
+def test_summary_bounds_concurrency_and_is_cached(monkeypatch):
+    monkeypatch.setattr(owner_module.settings, "OWNER_SUMMARY_CONCURRENCY", 2)
+    owner_summary_cache.clear()
+    running = 0
+    peak = 0
+    calls = []
+
+    async def get_owner_vehicles(*, owner_id):
+        calls.append(owner_id)
+        return [{"plate": f"P{i}"} for i in range(5)]
+
+    async def get_by_owner(*, vehicle_id, owner_id):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return [{"description": vehicle_id}]
+
+    monkeypatch.setattr(owner_service, "get_owner_vehicles", get_owner_vehicles)
+    monkeypatch.setattr(reparation_detail_service, "get_by_owner", get_by_owner)
+
+    loop = asyncio.get_event_loop()
+    summary = loop.run_until_complete(owner_service.get_summary(owner_id="1001"))
+    again = loop.run_until_complete(owner_service.get_summary(owner_id="1001"))
+
+    assert [v["reparation_details"][0]["description"] for v in summary] == [
+        f"P{i}" for i in range(5)
+    ]
+    assert peak == 2
+    assert again is summary
+    assert calls == ["1001"]
+
+    loop.run_until_complete(owner_summary_cache.invalidate_vehicle("P3"))
+    fresh = loop.run_until_complete(owner_service.get_summary(owner_id="1001"))
+    assert fresh is not summary
+    assert calls == ["1001", "1001"]
+
+
+def test_summary_fetched_across_an_invalidation_is_not_cached(monkeypatch):
+    owner_summary_cache.clear()
+    calls = []
+
+    async def get_owner_vehicles(*, owner_id):
+        calls.append(owner_id)
+        # A write to one of the owner's vehicles lands mid-fetch.
+        await owner_summary_cache.invalidate_vehicle("P0")
+        return [{"plate": "P0"}]
+
+    async def get_by_owner(*, vehicle_id, owner_id):
+        return []
+
+    monkeypatch.setattr(owner_service, "get_owner_vehicles", get_owner_vehicles)
+    monkeypatch.setattr(reparation_detail_service, "get_by_owner", get_by_owner)
+
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(owner_service.get_summary(owner_id="1001"))
+    loop.run_until_complete(owner_service.get_summary(owner_id="1001"))
+    assert calls == ["1001", "1001"]
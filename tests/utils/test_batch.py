@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.infra.httpx.exceptions import BackendUnavailableError
+from app.utils.batch import create_batch
+
+
+def test_create_batch_reports_each_item():
+    created = []
+
+    async def exists(item_id):
+        return item_id == "taken"
+
+    async def create(index):
+        if index == 4:
+            raise BackendUnavailableError("down")
+        created.append(index)
+        return {"index": index}
+
+    results = asyncio.get_event_loop().run_until_complete(
+        create_batch(["a", "taken", "b", "d", "c"], exists=exists, create=create)
+    )
+
+    assert [result["status"] for result in results] == [201, 400, 201, 201, 503]
+    assert sorted(created) == [0, 2, 3]
+    assert results[0]["item"] == {"index": 0}
+
+
+def test_create_batch_rejects_repeated_ids_before_calling_the_backend():
+    async def fail(*args):
+        raise AssertionError("backend called")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.get_event_loop().run_until_complete(
+            create_batch(["a", "b", "a"], exists=fail, create=fail)
+        )
+    assert error.value.status_code == 400
+    assert "a" in error.value.detail
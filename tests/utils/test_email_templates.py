@@ -0,0 +1,24 @@
+import os
+
+from app.utils.email_templates import EmailTemplate, render_template
+
+
+def test_render_matches_str_format():
+    with open("./app/email_templates/reparation_detail.html") as f:
+        expected = f.read().format(description="Brakes", cost=120.5)
+    rendered = render_template(
+        "reparation_detail.html", description="Brakes", cost=120.5
+    )
+    assert rendered == expected
+
+
+def test_auto_reload_picks_up_file_changes(tmp_path):
+    path = tmp_path / "greeting.html"
+    path.write_text("<p>Hello {name}</p>")
+    template = EmailTemplate(str(path), auto_reload=True)
+    assert template.render(name="Ana") == "<p>Hello Ana</p>"
+
+    path.write_text("<p>Bye {name}</p>")
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+    assert template.render(name="Ana") == "<p>Bye Ana</p>"
@@ -0,0 +1,62 @@
+import asyncio
+import json
+
+import pytest
+
+from app.utils import export
+
+
+def test_export_walks_pages_by_keyset(monkeypatch):
+    monkeypatch.setattr(export.settings, "MAX_PAGE_SIZE", 2)
+    rows = [{"id": i, "state": "received"} for i in range(1, 6)]
+    requested = []
+
+    async def get_page(*, params):
+        requested.append(params.get("after"))
+        after = params.get("after", 0)
+        return [row for row in rows if row["id"] > after][: params["limit"]]
+
+    async def collect(lines):
+        return "".join([line async for line in lines])
+
+    pages = export.iter_pages(get_page, params={"state": "received"}, key="id")
+    body = asyncio.get_event_loop().run_until_complete(
+        collect(export.ndjson_lines(pages))
+    )
+    assert [json.loads(line) for line in body.splitlines()] == rows
+    assert requested == [None, 2, 4]
+
+    pages = export.iter_pages(get_page, params={}, key="id")
+    body = asyncio.get_event_loop().run_until_complete(collect(export.csv_lines(pages)))
+    assert body.splitlines()[:2] == ["id,state", "1,received"]
+
+
+def test_export_drops_offset_after_first_page_and_aborts_on_errors(monkeypatch):
+    monkeypatch.setattr(export.settings, "MAX_PAGE_SIZE", 2)
+    requested = []
+
+    async def get_page(*, params):
+        requested.append(dict(params))
+        if params.get("after") == 4:
+            return None
+        start = params.get("after", params.get("skip", 0))
+        return [{"id": start + 1}, {"id": start + 2}]
+
+    async def collect(lines):
+        collected = []
+        with pytest.raises(export.ExportAbortedError):
+            async for line in lines:
+                collected.append(line)
+        return "".join(collected)
+
+    pages = export.iter_pages(get_page, params={"skip": 2}, key="id")
+    body = asyncio.get_event_loop().run_until_complete(
+        collect(export.ndjson_lines(pages))
+    )
+    assert [json.loads(line) for line in body.splitlines()] == [
+        {"id": 3},
+        {"id": 4},
+        {"error": "export aborted"},
+    ]
+    assert requested[0]["skip"] == 2
+    assert "skip" not in requested[1]
@@ -0,0 +1,34 @@
+import pytest
+from fastapi import HTTPException
+
+from app.utils.pagination import (
+    backend_params,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+    settings,
+)
+
+
+def test_cursor_round_trip_and_keyset_params():
+    cursor = encode_cursor("ABC123")
+    assert decode_cursor(cursor) == "ABC123"
+    params = backend_params(
+        {"brand": "Mazda", "color": "", "limit": 10_000, "cursor": cursor}
+    )
+    assert params == {
+        "brand": "Mazda",
+        "limit": settings.MAX_PAGE_SIZE,
+        "after": "ABC123",
+    }
+
+
+def test_next_cursor_only_when_page_is_full():
+    items = [{"plate": "A"}, {"plate": "B"}]
+    assert decode_cursor(next_cursor(items, limit=2, key="plate")) == "B"
+    assert next_cursor(items, limit=3, key="plate") is None
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(HTTPException):
+        decode_cursor("not-a-cursor")